@@ -0,0 +1,187 @@
+"""
+Benchmark of the complete MCMA workflow on the bundled test models.
+
+Each case (defined in Sys/bench.yml) is run in a fresh process; the numbers of itrs, itrs per second, times of phases,
+peak RSS, and the numbers of unique, close, and dominated solutions are stored in a json file, which can be compared
+with a previously stored (baseline) file. The results (json file and analysis dirs of the cases) are stored in the
+current working dir (not in the mcma package dir).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+from datetime import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+import yaml
+from yaml.loader import SafeLoader
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = 'bench'     # default analysis dir (sub-dir of the current working dir) for the benchmark runs
+CNT_KEYS = ['n_itr', 'n_unique', 'n_close', 'n_domin']     # counts expected to be equal to those of the baseline
+
+
+def read_args():
+    descr = """
+    Run the MCMA for the benchmark cases and store the performance measures in a json file.
+
+    Examples of usage:
+    python -m mcma.bench
+    python -m mcma.bench --only alves jg --solver appsi_highs --mxIter 100
+    python -m mcma.bench --out new.json --baseline old.json --tol 0.2
+    python -m mcma.bench --dir /tmp/bench --out /tmp/bench/bench.json
+    """
+    parser = argparse.ArgumentParser(description=descr, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=os.path.join(SCRIPT_DIR, 'Sys', 'bench.yml'),
+                        help="yaml file with the benchmark cases (default: Sys/bench.yml).")
+    parser.add_argument("--only", nargs='+', help="names of cases to be run (default: all).")
+    parser.add_argument("--solver", help="solver used for all cases (overrides the cases' specs).")
+    parser.add_argument("--mxIter", type=int, help="number of itrs for all cases (overrides the cases' specs).")
+    parser.add_argument("--dir", default=BENCH_DIR,
+                        help=f"analysis dir of the benchmark runs (default: {BENCH_DIR} in the current working dir).")
+    parser.add_argument("--out", default='bench.json',
+                        help="json file for the results (default: bench.json in the current working dir).")
+    parser.add_argument("--baseline", help="json file with the baseline results to be compared with.")
+    parser.add_argument("--tol", type=float, default=0.25,
+                        help="max. relative deterioration of speed and memory use (default: 0.25).")
+    return parser.parse_args()
+
+
+def rd_cases(f_name, only=None, over=None):    # return dict {case_name: usr-cfg options} of the selected cases
+    with open(f_name) as f:
+        specs = yaml.load(f, Loader=SafeLoader)
+    defaults = specs.get('defaults', {})
+    cases = {}
+    for (name, spec) in specs.get('cases').items():
+        if only is not None and name not in only:
+            continue
+        assert 'model' in spec and 'crit_def' in spec, f'case "{name}": both model and crit_def must be defined.'
+        usr_cfg = dict(defaults)
+        usr_cfg.update(spec)
+        usr_cfg.update(over or {})
+        cases.update({name: usr_cfg})
+    if only is not None:
+        for name in only:
+            assert name in cases, f'case "{name}" not defined in "{f_name}".'
+    return cases
+
+
+# noinspection SpellCheckingInspection
+def run_case(name, usr_cfg, bench_dir):   # run the case (in a fresh process), return dict of its performance measures
+    os.environ['MPLBACKEND'] = 'Agg'    # plots are generated (and saved) but not shown
+    from .cfg import Config     # imported here to be imported (with matplotlib) only in the process of the case
+    from .driver import driver
+
+    os.chdir(bench_dir)
+    res_dir = f'Results/{name}/'
+    shutil.rmtree(res_dir, ignore_errors=True)     # results of the previous run of the case, including payoff table
+    os.makedirs(res_dir, mode=0o755)
+    usr_cfg = dict(usr_cfg)
+    usr_cfg.update({'model_id': os.path.join(SCRIPT_DIR, usr_cfg.pop('model')), 'resDir': res_dir,
+                    'payoff': f'{res_dir}payoff.txt'})
+    with open('cfg.yml', 'w') as f:
+        yaml.dump(usr_cfg, f)
+
+    default_stdout = sys.stdout
+    f_out = open(f'{res_dir}stdOut.txt', 'w')
+    sys.stdout = f_out
+    try:
+        config = Config()
+        t_start = time.perf_counter()
+        wflow = driver(config.data)
+        t_run = time.perf_counter() - t_start
+    finally:
+        f_out.close()
+        sys.stdout = default_stdout
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss   # kB on Linux, bytes on macOS
+    rss_mb = rss / (1024. * 1024.) if sys.platform == 'darwin' else rss / 1024.
+    tm = wflow.tm
+    t_itr = sum(row[1] for row in tm.rows)     # time of all itrs (excluding the initialization and reports)
+    par_rep = wflow.par_rep
+    return {'n_itr': len(tm.rows), 'n_unique': 0 if par_rep is None else len(par_rep.sols),
+            'n_close': 0 if par_rep is None else len(par_rep.clSols),
+            'n_domin': 0 if par_rep is None else par_rep.n_domin,
+            'itr_per_sec': len(tm.rows) / max(t_itr, 1.e-9), 'run_sec': t_run, 'itr_sec': t_itr,
+            'phases': {phase: val for (phase, val) in tm.tot.items()}, 'rss_mb': rss_mb}
+
+
+def compare(res, base, tol):   # print comparison of the results with the baseline, return number of regressions
+    n_reg = 0
+    print(f'\nComparison with the baseline (tolerance {tol:.0%}):')
+    print(f'{"case":<10} {"itr/s":>10} {"base":>10} {"RSS [MB]":>10} {"base":>10}  status')
+    for (name, cur) in res.items():
+        old = base.get(name)
+        if old is None or 'error' in old or 'error' in cur:
+            print(f'{name:<10} {"":>10} {"":>10} {"":>10} {"":>10}  not compared')
+            continue
+        msg = []
+        for key in CNT_KEYS:
+            if cur.get(key) != old.get(key):
+                msg.append(f'{key} {old.get(key)} -> {cur.get(key)}')
+        if cur.get('itr_per_sec') < (1. - tol) * old.get('itr_per_sec'):
+            msg.append('slower')
+        if cur.get('rss_mb') > (1. + tol) * old.get('rss_mb'):
+            msg.append('more memory')
+        if len(msg):
+            n_reg += 1
+        print(f'{name:<10} {cur.get("itr_per_sec"):>10.1f} {old.get("itr_per_sec"):>10.1f} '
+              f'{cur.get("rss_mb"):>10.1f} {old.get("rss_mb"):>10.1f}  {"; ".join(msg) if len(msg) else "ok"}')
+    return n_reg
+
+
+# noinspection SpellCheckingInspection
+def main():
+    args = read_args()
+    f_cases = os.path.abspath(args.cases)
+    f_out = os.path.abspath(args.out)
+    bench_dir = os.path.abspath(args.dir)
+    f_base = None if args.baseline is None else os.path.abspath(args.baseline)
+    over = {}   # options overriding the cases' specs
+    if args.solver is not None:
+        over.update({'solver': args.solver})
+    if args.mxIter is not None:
+        over.update({'mxIter': args.mxIter})
+    cases = rd_cases(f_cases, args.only, over)
+    if not os.path.exists(bench_dir):
+        os.makedirs(bench_dir, mode=0o755)
+
+    res = {}
+    for (name, usr_cfg) in cases.items():
+        print(f'Running benchmark case "{name}" ({usr_cfg.get("mxIter")} itrs, solver {usr_cfg.get("solver")}).')
+        with ProcessPoolExecutor(max_workers=1) as exe:    # fresh process for each case (e.g., for peak RSS)
+            try:
+                case_res = exe.submit(run_case, name, usr_cfg, bench_dir).result()
+            except Exception as e:
+                case_res = {'error': f'{type(e).__name__}: {e}'}
+        res.update({name: case_res})
+        if 'error' in case_res:
+            print(f'\tcase "{name}" failed: {case_res.get("error")}')
+        else:
+            print(f'\t{case_res.get("n_itr")} itrs, {case_res.get("itr_per_sec"):.1f} itr/s, '
+                  f'{case_res.get("n_unique")} unique, {case_res.get("n_close")} close, '
+                  f'{case_res.get("n_domin")} dominated solutions, peak RSS {case_res.get("rss_mb"):.1f} MB.')
+
+    out = {'date': str(dt.now()), 'python': platform.python_version(), 'platform': platform.platform(),
+           'cases': res}
+    out_dir = os.path.dirname(f_out)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir, mode=0o755)
+    with open(f_out, 'w') as f:
+        json.dump(out, f, indent=2)
+    print(f'\nBenchmark results stored in "{f_out}".')
+
+    if f_base is not None:
+        with open(f_base) as f:
+            base = json.load(f).get('cases')
+        n_reg = compare(res, base, args.tol)
+        if n_reg:
+            print(f'{n_reg} case(s) differ from the baseline.')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
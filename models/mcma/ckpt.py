@@ -0,0 +1,55 @@
+"""
+Checkpoints of the complete workflow state (for resuming an interrupted analysis without re-solving)
+"""
+import os
+import time
+import pickle
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+class Ckpt:     # periodically store (and, for resuming, restore) the WrkFlow object and the iteration counter
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.f_ckpt = f'{cfg.get("resDir")}ckpt.pkl'   # file with the last checkpoint
+        self.n_itr = cfg.get('ckptItr', 0)    # store checkpoint every n_itr iterations (0: no itr-based checkpoints)
+        self.n_sec = cfg.get('ckptSec', 0)    # store checkpoint every n_sec seconds (0: no time-based checkpoints)
+        self.last_itr = 0   # iteration of the last checkpoint
+        self.last_time = time.time()  # time of the last checkpoint
+        self.n_saved = 0    # number of checkpoints stored in the current run
+        if self.n_itr > 0 or self.n_sec > 0:
+            print(f'Checkpoints stored in "{self.f_ckpt}" every {self.n_itr} itrs, {self.n_sec} sec '
+                  f'(0 means: not used).')
+
+    def chk(self, wflow, n_itr, pending):   # store the checkpoint, if the itr or time interval is exceeded
+        do_itr = 0 < self.n_itr <= n_itr - self.last_itr
+        do_sec = 0 < self.n_sec <= time.time() - self.last_time
+        if do_itr or do_sec:
+            self.save(wflow, n_itr, pending)
+        return do_itr or do_sec     # True, if the checkpoint was stored
+
+    @timed('ckpt')
+    def save(self, wflow, n_itr, pending):  # store the state needed for starting the n_itr-th iteration
+        state = {'wflow': wflow, 'n_itr': n_itr, 'pending': pending}
+        f_tmp = f'{self.f_ckpt}.tmp'
+        with open(f_tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f_tmp, self.f_ckpt)  # atomic: the previous checkpoint is kept, if the writing is interrupted
+        self.last_itr = n_itr
+        self.last_time = time.time()
+        self.n_saved += 1
+        if wflow.mc.verb > 1:
+            print(f'Checkpoint for starting itr {n_itr} stored in "{self.f_ckpt}".')
+
+    def load(self, m1):     # return the WrkFlow object, the itr to be started, and the pending solutions
+        assert os.path.exists(self.f_ckpt), f'Checkpoint file "{self.f_ckpt}" not available; resume impossible.'
+        with open(self.f_ckpt, 'rb') as f:
+            state = pickle.load(f)
+        wflow = state.get('wflow')
+        n_itr = state.get('n_itr')
+        wflow.cfg.update(self.cfg)  # the cfg dict is shared by the restored objects; the current options apply
+        wflow.rep.m1 = m1   # the core model is not stored in checkpoints
+        self.last_itr = n_itr
+        print(f'\nResuming the analysis from the checkpoint "{self.f_ckpt}": itr {n_itr}, '
+              f'analysis stage {wflow.cur_stage}.')
+        return wflow, n_itr, state.get('pending')
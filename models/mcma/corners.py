@@ -14,8 +14,10 @@ class Corners:
         self.corners = []         # criteria states at the Pareto-set corners
         self.a_corners = []       # corners defined by the achievements
         self.s_corners = []       # id of solution defining the corresponding corner
-        self.cur_corner = 0       # seq_no of current corner
-        self.n_corners = 0        # number of prepared corners
+        self.todo = []            # indices (in self.corners) of corners to be computed
+        self.c_sols = {}          # itr_id of the solution computed for each (already computed) corner
+        self.cur_corner = 0       # seq_no of current corner (in self.todo)
+        self.n_corners = 0        # number of prepared corners (to be computed)
         self.all_done = False     # set to True, after last corner processed
         self.mk_corners()         # make list of corners
         # self.lst_corners()
@@ -42,7 +44,8 @@ class Corners:
                     a_cor.update({i: 'i'})   # all remaining criteria, if any to be ignored
                 self.corners.append(a_cor)
                 # print(f'p = {p}, a_cor = {a_cor}')
-        self.n_corners = len(self.corners)
+        self.todo = list(range(len(self.corners)))
+        self.n_corners = len(self.todo)
         if self.verb > 1:
             print(f'Prepared specs of {self.n_corners} corners for {self.n_crit} criteria.')
             self.lst_corners()
@@ -59,9 +62,14 @@ class Corners:
                 print(f'preferences for the last of {self.n_corners} corners generated.')
             self.all_done = True
 
+    def set_cur(self, cur_corner):   # restore the state set by next_corner() (used for solutions computed in batches)
+        assert 0 < cur_corner <= self.n_corners, f'{cur_corner}-th out of {self.n_corners} corners cannot be restored.'
+        self.cur_corner = cur_corner
+        self.all_done = self.cur_corner == self.n_corners
+
     # noinspection GrazieInspection
     def set_ar(self):   # set A/R values for the currently requested corner
-        corner = self.corners[self.cur_corner]
+        corner = self.corners[self.todo[self.cur_corner]]
         if self.verb > 2:
             print(f'AR for corner: {corner}')
         for (i, cr) in enumerate(self.mc.cr):
@@ -96,24 +104,57 @@ class Corners:
                       f'R {cr.val2ach(cr.res)}')
         pass
 
-    def next_sol(self, is_pareto, n_itr):
+    def next_sol(self, is_pareto, n_itr, close_id=None):    # close_id: id of the Pareto sol close to the solution
+        self.c_sols.update({self.todo[self.cur_corner - 1]: n_itr})     # the corner of the solution (also non-Pareto)
+        if close_id is not None and close_id not in self.s_corners:     # close to a sol (rescaled after a reset)
+            is_pareto = True    # the close solution defines the corner
+            n_itr = close_id
         if is_pareto:
-            cor = ''
-            for (i, cr) in enumerate(self.mc.cr):
-                if i > 0:
-                    cor = f'{cor}, {cr.name}: {cr.a_val:.1f}'
-                else:
-                    cor = f'{cr.name}: {cr.a_val:.1f}'
+            cor = self.cor_str([cr.a_val for cr in self.mc.cr])
             self.a_corners.append(cor)
             self.s_corners.append(n_itr)
             # cotodo: add solution id
         else:
             print('Non-Pareto solution ignored in corners definitions.')
         if self.all_done:
-            print(f'\nPareto-set {len(self.a_corners)} (unique) corners:        ')
-            for (i, cor) in enumerate(self.a_corners):
-                print(f'corner {i}, sol_id {self.s_corners[i]}:  ({cor})')
-            print(f'Switch to computing Pareto-front representation based on cuboids. ===============================')
+            self.prn_done()
+        return self.all_done
+
+    def prn_done(self):     # list the corners (after all corners are done)
+        print(f'\nPareto-set {len(self.a_corners)} (unique) corners:        ')
+        for (i, cor) in enumerate(self.a_corners):
+            print(f'corner {i}, sol_id {self.s_corners[i]}:  ({cor})')
+        print(f'Switch to computing Pareto-front representation based on cuboids. ===============================')
+
+    def cor_str(self, a_vals):   # return the corner defined by the achievements as a string
+        cor = ''
+        for (i, cr) in enumerate(self.mc.cr):
+            if i > 0:
+                cor = f'{cor}, {cr.name}: {a_vals[i]:.1f}'
+            else:
+                cor = f'{cr.name}: {a_vals[i]:.1f}'
+        return cor
+
+    # Called after a reset (nadir update): the corners computed before the reset (by the old Corners object) are reused,
+    # if the A/R of their active and not-active criteria are not changed, i.e., if the nadir of none of these criteria
+    # changed; the ignored criteria enter only the (small) regularizing term, therefore they are not checked.
+    def reuse(self, old, changed, par_rep):    # changed: indices of criteria with the changed nadir
+        self.todo = []
+        for (j, corner) in enumerate(self.corners):
+            itr_id = old.c_sols.get(j)
+            if itr_id is None or any(corner.get(i) in ['a', 'n'] for i in changed):
+                self.todo.append(j)     # the corner was not computed, or its A/R are changed
+                continue
+            self.c_sols.update({j: itr_id})
+            s = par_rep.sols.get(itr_id)
+            if s is not None:   # the solution remains Pareto (in the rescaled representation)
+                self.a_corners.append(self.cor_str(s.a_vals))
+                self.s_corners.append(itr_id)
+        self.n_corners = len(self.todo)
+        self.all_done = self.n_corners == 0
+        print(f'{len(self.c_sols)} corners reused, {self.n_corners} corners to be computed after the reset.')
+        if self.all_done:
+            self.prn_done()
         return self.all_done
 
     def lst_corners(self):
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class CrPref:     # attributes of item of preference specs
     def __init__(self, parent, asp, res, act=True):
         self.parent = parent  # seq_no (in mc container) of parent crit
@@ -57,14 +60,31 @@ class Crit:     # definition and attributes of a single criterion
             print(f'\tcrit "{self.name}": {val=:.2e}, {a_val=:.2f}, U {self.utopia:.2e}, N {self.nadir:.2e}')
         return a_val
 
+    def vals2ach(self, vals):     # vectorized val2ach() for an array of values (the warnings are not printed)
+        vals = np.asarray(vals, dtype=float)
+        rng = abs(self.utopia - self.nadir)
+        assert rng / max(abs(self.utopia), abs(self.nadir)) > self.minRange, f'vals2ach(): crit {self.name} has '\
+            f'too small difference between U {self.utopia} and N {self.nadir}.'
+        a_vals = np.round(self.sc_ach * np.abs(vals - self.nadir) / rng, 2)
+        sc = np.maximum(np.abs(vals), max(abs(self.nadir), 1.0))
+        close = np.abs(self.nadir - vals) / sc < 10. * self.minRange
+        worse = self.mult * (self.nadir - vals) > 0.     # nadir better than val
+        return np.where(~close & worse, -a_vals, a_vals)
+
     # noinspection SpellCheckingInspection
-    def ach2val(self, achiv):   # return criterion value corresponding to CAF = achiv
+    def ach2val(self, achiv):   # return criterion value corresponding to CAF = achiv (also for an array of achiv)
         rng = abs(self.utopia - self.nadir)
         rng_fr = rng * achiv / self.sc_ach
         val = self.nadir + self.mult * rng_fr
         # print(f'\tach2val(): crit "{self.name}": {achiv=:.2f}, {val=:.2e}, U {self.utopia:.2e}, N {self.nadir:.2e}')
         return val
 
+    def getPref(self):     # return current preferences (activity, A/R) for restoring them later by setPref()
+        return self.is_active, self.is_ignored, self.is_fixed, self.asp, self.res
+
+    def setPref(self, pref):     # set preferences returned by getPref()
+        self.is_active, self.is_ignored, self.is_fixed, self.asp, self.res = pref
+
     def setUtopia(self, val):   # to be called only once for each criterion
         assert self.utopia is None, f'utopia of crit {self.name} already set.'
         # todo: for small values use shift instead multiplication
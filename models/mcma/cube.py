@@ -1,24 +1,85 @@
 import math
-# noinspection SpellCheckingInspection
-from operator import itemgetter  # , attrgetter
+import heapq
+from itertools import combinations
+import numpy as np
+from .timing import timed  # timing of the iteration phases
 
 # todo: add to ParSol:
 #   prune marker (to close to another solution) to skip (almost) duplicated solutions during cube generation
 #   improve info on CAF (global, in [U, N], vs itr in [A, R]
 
+NO_ID = np.iinfo(np.int64).min     # stored in SolArch int-arrays instead of None (undefined id)
+
+
+def box_hv(a_vals):     # hypervolume of the box spanned by the points (rows of a_vals), not dominated by the points
+    a_vals = np.asarray(a_vals, dtype=float)
+    lo = a_vals.min(axis=0)
+    vol = float(np.prod(a_vals.max(axis=0) - lo))  # volume of the box, reduced below by the parts dominated by points
+    for k in range(1, len(a_vals) + 1):     # inclusion-exclusion: the union of boxes [lo, point]
+        for sub in combinations(range(len(a_vals)), k):
+            vol -= (-1) ** (k + 1) * float(np.prod(a_vals[list(sub)].min(axis=0) - lo))
+    return max(vol, 0.)
+
 
 # noinspection SpellCheckingInspection
-class ParSol:     # one Pareto solution
-    def __init__(self, itr_id, cube_id, vals, a_vals):
-        self.itr_id = itr_id    # iter. id: positive indicates cube-seq, negative for Pareto-set corners
-        self.cube_id = cube_id	 # id (seq_no) of the parent cube
-        self.vals = vals  # list of (not scaled) criteria values of the itr_id solution
-        self.a_vals = a_vals  # list of achievement values
-        self.domin = 0  # >= 0: is Pareto, domin > 0: itr_id of dominated, domin < 0: itr_id of the dominating solution
-        self.closeTo = None     # None replaced by itr_id of a first solution that is close
-        self.distMx = None      # None replaced by L-inf distance for close/duplicated solutions
-        # print(f'Solution of itr_id {itr_id}: crit. values: {self.vals}, (achievements: {self.a_vals})')
-        print(f'Solution[{itr_id}] a_vals: {self.a_vals}')
+class ParSol:     # one Pareto solution: (lightweight) view of the row of SolArch arrays
+    __slots__ = ('arch', 'row')
+
+    def __init__(self, arch, row):
+        self.arch = arch    # SolArch object storing attributes of the solution
+        self.row = row      # row of the solution in the arch arrays
+
+    def __eq__(self, other):    # views of the same row represent the same solution
+        return isinstance(other, ParSol) and self.arch is other.arch and self.row == other.row
+
+    def __hash__(self):
+        return self.row
+
+    def __repr__(self):
+        return f'ParSol[{self.itr_id}]'
+
+    @property
+    def itr_id(self):   # iter. id: positive indicates cube-seq, negative for Pareto-set corners
+        return int(self.arch.itr_id[self.row])
+
+    @property
+    def cube_id(self):  # id (seq_no) of the parent cube
+        val = int(self.arch.cube_id[self.row])
+        return None if val == NO_ID else val
+
+    @property
+    def vals(self):     # list of (not scaled) criteria values of the itr_id solution
+        return self.arch.vals[self.row].tolist()
+
+    @property
+    def a_vals(self):   # list of achievement values
+        return self.arch.a_vals[self.row].tolist()
+
+    @property
+    def domin(self):    # >= 0: is Pareto, domin > 0: itr_id of dominated, domin < 0: itr_id of the dominating solution
+        return int(self.arch.domin[self.row])
+
+    @domin.setter
+    def domin(self, val):
+        self.arch.domin[self.row] = val
+
+    @property
+    def closeTo(self):  # None replaced by itr_id of a first solution that is close
+        val = int(self.arch.closeTo[self.row])
+        return None if val == NO_ID else val
+
+    @closeTo.setter
+    def closeTo(self, val):
+        self.arch.closeTo[self.row] = NO_ID if val is None else val
+
+    @property
+    def distMx(self):   # None replaced by L-inf distance for close/duplicated solutions
+        val = float(self.arch.distMx[self.row])
+        return None if math.isnan(val) else val
+
+    @distMx.setter
+    def distMx(self, val):
+        self.arch.distMx[self.row] = math.nan if val is None else val
 
     def neigh_inf(self, cube, do_print = False):     # print info on distances to corners of the parent cube
         s1 = cube.s1
@@ -55,7 +116,7 @@ class ParSol:     # one Pareto solution
         return 0    # self is Pareto, i.e., neither dominating nor dominated
 
     def is_close(self, s2, minDist):     # set self.closeTo and return True, if self is close to solution s2
-        self.distMx = 0.
+        distMx = 0.
         for (a1, a2) in zip(self.a_vals, s2.a_vals):  # loop over scaled values of criteria
             dist = abs(a1 - a2)
             # minDist = 1.0   # rather demanding in [0, 100] CAF scale
@@ -63,12 +124,180 @@ class ParSol:     # one Pareto solution
             if dist > minDist:   # L-inf (Tchebyshev) norm used for defining close solutions
                 self.distMx = None
                 return False
-            self.distMx = max(self.distMx, dist)
+            distMx = max(distMx, dist)
+        self.distMx = distMx
         # achievements of all criteria differ less than minDist
         self.closeTo = s2.itr_id
         return True
 
 
+# noinspection SpellCheckingInspection
+class CandQ:     # priority queue of candidate cubes: the largest priority first (then the largest, the first added)
+    def __init__(self):
+        self.heap = []      # heap of items (-prio, -size, c_id); items of removed cubes are skipped (lazy deletion)
+        self.sizes = {}     # {c_id: size} of the candidate cubes
+        self.prios = {}     # {c_id: priority} of the candidate cubes (by default: the size)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __iter__(self):     # (c_id, size) of the candidates in the order of adding
+        return iter(self.sizes.items())
+
+    def __contains__(self, c_id):
+        return c_id in self.sizes
+
+    def copy(self):     # return list of (c_id, size) of the candidates
+        return list(self.sizes.items())
+
+    def append(self, item, prio=None):     # add candidate (c_id, size) of the given priority (None: the size)
+        (c_id, size) = item
+        assert c_id not in self.sizes, f'CandQ::append(): cube[{c_id}] already in the candidates.'
+        prio = size if prio is None else prio
+        self.sizes.update({c_id: size})
+        self.prios.update({c_id: prio})
+        heapq.heappush(self.heap, (-prio, -size, c_id))
+
+    def remove(self, c_id):     # remove the candidate (its heap item is removed when it gets to the top)
+        self.sizes.pop(c_id)
+        self.prios.pop(c_id)
+        if len(self.heap) > 2 * len(self.sizes) + 100:    # rebuild the heap, if mostly made of removed items
+            self.heap = [(-self.prios[c_id], -size, c_id) for (c_id, size) in self.sizes.items()]
+            heapq.heapify(self.heap)
+
+    def pop(self):  # remove and return (c_id, size) of the candidate of the largest priority
+        while True:
+            (neg_prio, neg_size, c_id) = heapq.heappop(self.heap)
+            if c_id in self.sizes:
+                self.prios.pop(c_id)
+                return c_id, self.sizes.pop(c_id)
+
+
+# noinspection SpellCheckingInspection
+class CubeBoxes:     # boxes (in crit-values) of the candidate cubes, and numbers of solutions inside each box
+    """the number of solutions inside a candidate cube is updated for each added/removed Pareto solution, therefore
+    checking if the cube is still empty (when it is selected) does not require scanning all solutions."""
+    def __init__(self, parRep, size=256):
+        self.parRep = parRep    # ParRep object
+        self.n_cubes = 0    # number of the used rows (max cube.id + 1)
+        self.v1 = np.zeros((size, parRep.mc.n_crit))    # crit-values of the solutions defining the cubes
+        self.v2 = np.zeros((size, parRep.mc.n_crit))
+        self.id1 = np.full(size, NO_ID, dtype=np.int64)    # itr_ids of the solutions defining the cubes
+        self.id2 = np.full(size, NO_ID, dtype=np.int64)
+        self.n_in = np.zeros(size, dtype=np.int64)     # number of solutions inside the cube
+        self.alive = np.zeros(size, dtype=bool)     # True for candidate cubes
+
+    def has(self, c_id):    # return True, if c_id is a candidate cube
+        return c_id is not None and c_id < self.n_cubes and self.alive[c_id]
+
+    def add(self, cube):    # add the (empty) candidate cube (rows indexed by cube.id)
+        while cube.id >= len(self.alive):   # double the size of the arrays
+            self.v1 = np.vstack([self.v1, np.zeros(self.v1.shape)])
+            self.v2 = np.vstack([self.v2, np.zeros(self.v2.shape)])
+            self.id1 = np.concatenate([self.id1, np.full(len(self.id1), NO_ID, dtype=np.int64)])
+            self.id2 = np.concatenate([self.id2, np.full(len(self.id2), NO_ID, dtype=np.int64)])
+            self.n_in = np.concatenate([self.n_in, np.zeros(len(self.n_in), dtype=np.int64)])
+            self.alive = np.concatenate([self.alive, np.zeros(len(self.alive), dtype=bool)])
+        self.v1[cube.id] = cube.s1.vals
+        self.v2[cube.id] = cube.s2.vals
+        self.id1[cube.id] = cube.s1.itr_id
+        self.id2[cube.id] = cube.s2.itr_id
+        self.n_in[cube.id] = 0
+        self.alive[cube.id] = True
+        self.n_cubes = max(self.n_cubes, cube.id + 1)
+
+    def remove(self, c_id):     # remove the cube from the candidates
+        self.alive[c_id] = False
+
+    def upd(self, s, delta):    # add delta to the numbers of solutions inside the candidate cubes containing s
+        n = self.n_cubes
+        itr_id = s.itr_id
+        inside = self.parRep.in_box(self.parRep.arch.vals[s.row], self.v1[:n], self.v2[:n])
+        inside &= self.alive[:n] & (self.id1[:n] != itr_id) & (self.id2[:n] != itr_id)     # skip cube's sols
+        self.n_in[:n][inside] += delta
+
+
+# noinspection SpellCheckingInspection
+class ExclRegs:     # regions (in achievements) proven to contain no new Pareto solutions (option exclReg)
+    """a cube, for which the solution is close to an already found solution, proves that no solution has the CAFs of
+    all active criteria greater than the optimal AF; the corresponding region (the achievements above the A/R point of
+    the cube at the optimal AF level, and within the cube's edges of the fixed criteria) is stored; the cubes (or
+    sol-pairs) inside such regions are skipped, and the cubes covered by a region in all but one criterion are cut."""
+    def __init__(self, parRep):
+        self.parRep = parRep    # ParRep object
+        self.tol = parRep.cfg.get('tolClose', 0.01)     # tolerance (in achievements) of the region bounds
+        self.lo = np.zeros((0, parRep.mc.n_crit))   # lower bounds of the regions
+        self.hi = np.zeros((0, parRep.mc.n_crit))   # upper bounds of the regions (inf for active criteria)
+        self.n_skip = 0     # number of cubes (or sol-pairs) skipped
+        self.n_cut = 0      # number of cubes cut
+
+    def __len__(self):
+        return len(self.lo)
+
+    def add(self, cube, s):     # add the region proven empty by the solution s (close to another sol) of the cube
+        if self.parRep.mc.deg_exp or len(cube.aspAch) != self.parRep.mc.n_crit:
+            return      # A/R of the cube not set (or expanded degenerated edges)
+        asp = np.array(cube.aspAch)
+        res = np.array(cube.resAch)
+        span = asp - res
+        act = ~np.array(cube.degen) & (span > 0.)     # active criteria
+        if not act.any():
+            return
+        lev = ((np.array(s.a_vals) - res)[act] / span[act]).min()   # optimal AF (scaled to [0, 1] between R and A)
+        if lev > 1.:
+            return      # above A, the CAFs are flatter: the region cannot be defined by the mid-segments
+        lev = max(lev, 0.)  # below R, the CAFs are steeper: the region defined by R is inside the proven one
+        lo = np.array([min(cube.a_ends(i)) for i in range(len(span))])
+        hi = np.array([max(cube.a_ends(i)) for i in range(len(span))])
+        lo[act] = res[act] + lev * span[act]
+        hi[act] = np.inf
+        self.lo = np.vstack([self.lo, lo])
+        self.hi = np.vstack([self.hi, hi])
+        if self.parRep.cfg.get('verb') > 1:
+            print(f'Region above {np.round(lo, 2).tolist()} (cube[{cube.id}]) contains no new solutions.')
+
+    def bounds(self, a_vals):   # return upper bounds of the part (that might contain new sols) of the box spanned
+        """by the points (rows of a_vals); None, if the box is inside a region. A region covering the box in all but
+        one (active) criterion cuts the box edge of this criterion at the lower bound of the region."""
+        a_vals = np.asarray(a_vals, dtype=float)
+        lo = a_vals.min(axis=0)
+        hi = a_vals.max(axis=0)
+        if not len(self.lo):
+            return hi
+        is_cut = True
+        while is_cut:   # a cut might make the box covered (in more criteria) by other regions
+            is_cut = False
+            inside = (lo >= self.lo - self.tol) & (hi <= self.hi + self.tol)
+            n_out = (~inside).sum(axis=1)   # number of criteria in which the box is not covered by the region
+            if (n_out == 0).any():
+                return None
+            for j in np.flatnonzero(n_out == 1):
+                k = int(np.argmin(inside[j]))
+                if np.isinf(self.hi[j, k]) and self.lo[j, k] < hi[k]:   # cut only the edges of active criteria
+                    hi[k] = self.lo[j, k]
+                    is_cut = True
+        return hi
+
+    def skip(self, a_vals):     # return True, if the regions leave a too small part of the box (spanned by a_vals)
+        a_vals = np.asarray(a_vals, dtype=float)
+        hi = self.bounds(a_vals)
+        lo = a_vals.min(axis=0)
+        min_size = self.parRep.cubes.min_size
+        if hi is None or (hi - lo).max() < min_size <= (a_vals.max(axis=0) - lo).max():   # small cubes handled by Cubes
+            self.n_skip += 1
+            return True
+        return False
+
+    def cut(self, cube):    # cut the cube to the part to be explored; return False, if the part is too small
+        if self.skip([s.a_vals for s in cube.verts()]):
+            return False
+        hi = self.bounds([s.a_vals for s in cube.verts()])
+        if (hi < np.array([max(cube.a_ends(i)) for i in range(len(hi))])).any():
+            cube.cut(hi)
+            self.n_cut += 1
+        return True
+
+
 # noinspection SpellCheckingInspection
 class Cubes:     # collection of aCubes
     def __init__(self, parRep):
@@ -78,17 +307,26 @@ class Cubes:     # collection of aCubes
         self.min_size = float(parRep.mc.opt('mxGap', 5))    # cube's min. LInf size for including the cube to analysis
         self.lastSize = None    # size of last-selected cube (experimental)
         self.all_cubes = {}     # all generated cubes: keys defined by cube's id
-        self.cand = []          # cubes that are candidates for next iteration
+        self.cand = CandQ()     # cubes that are candidates for next iteration
+        self.boxes = None   # boxes of candidate cubes (not used for mCube, grid, simplex: the cubes are not checked)
+        if not (parRep.mc.opt('mCube', False) or parRep.mc.opt('grid', False) or parRep.mc.opt('simplex', False)):
+            self.boxes = CubeBoxes(parRep)
         self.small = 0      # number of small ignored
         self.filled = 0     # number of non-empty ignored
+        self.prio = parRep.mc.opt('cubePrio', 'size')   # priority of the candidates: size, or hv (hypervolume)
+        if self.prio not in ['size', 'hv']:
+            raise Exception(f'Cubes::Cubes(): unknown cubePrio option: "{self.prio}" (should be size or hv).')
 
     def add(self, cube):    # add a new cube, if it is large enough and non-empty
         skip = self.parRep.mc.opt('skipCubes', False)   # ZN method: skip cubes larger than the previous cube
         if skip and self.lastSize is not None and self.lastSize < cube.size:
             # print(f'skiping new cube: size {cube.size:.2f} > the last cube size: {self.lastSize:.2f} ---------')
             return
+        if self.parRep.excl is not None and not self.parRep.mc.opt('simplex', False) and not self.parRep.excl.cut(cube):
+            return      # the cube is inside (or only its small part is outside) the regions without new solutions
         if cube.size >= self.min_size:
-            if self.parRep.mc.opt('mCube', False) or self.parRep.mc.opt('grid', False):  # skip empty-cube check
+            mc = self.parRep.mc
+            if mc.opt('mCube', False) or mc.opt('grid', False) or mc.opt('simplex', False):  # skip empty-cube check
                 cube.empty = True
                 is_empty = True
             else:
@@ -96,7 +334,9 @@ class Cubes:     # collection of aCubes
             if is_empty:
                 cube.id = len(self.all_cubes)
                 self.all_cubes.update({cube.id: cube})
-                self.cand.append((cube.id, cube.size))
+                self.cand.append((cube.id, cube.size), cube.hv() if self.prio == 'hv' else None)
+                if self.boxes is not None:
+                    self.boxes.add(cube)
                 # print(f'cube {cube.id} added to the list of cubes defining neighbors.')
             else:
                 self.filled += 1
@@ -109,16 +349,22 @@ class Cubes:     # collection of aCubes
         # noinspection PySimplifyBooleanCheck
         if cube.empty == False:
             return False
-        for s in self.sols:     # check, if any solution is in the c-cube
-            if s.itr_id == cube.s1.itr_id or s.itr_id == cube.s2.itr_id:  # skip solutions defining the cube
-                continue
-            if self.parRep.is_inside(s, cube.s1, cube.s2):
-                # print(f'sol {s.itr_id} is between sols [{cube.s1.itr_id}, {cube.s2.itr_id}].')
-                cube.empty = False
-                return False    # the cube has a solution inside
+        if self.boxes is not None and self.boxes.has(cube.id):    # solutions inside a candidate cube are counted
+            cube.empty = bool(self.boxes.n_in[cube.id] == 0)
+            return cube.empty
+        rows = self.sols.rows()     # check (for all solutions at once), if any solution is in the c-cube
+        arch = self.parRep.arch
+        other = (arch.itr_id[rows] != cube.s1.itr_id) & (arch.itr_id[rows] != cube.s2.itr_id)  # skip cube's sols
+        if (self.parRep.in_box(arch.vals[rows], arch.vals[cube.s1.row], arch.vals[cube.s2.row]) & other).any():
+            cube.empty = False
+            return False    # the cube has a solution inside
         cube.empty = True
         return True    # the cube is empty
 
+    def sol_in(self, s, delta):     # update numbers of sols inside candidate cubes by the added (1)/removed (-1) sol s
+        if self.boxes is not None:
+            self.boxes.upd(s, delta)
+
     def get(self, c_id):    # return the cube by its id
         assert c_id < len(self.all_cubes), f'Cubes::get(): requested cube[{c_id}], only {len(self.all_cubes)} defined.'
         return self.all_cubes[c_id]
@@ -134,6 +380,8 @@ class Cubes:     # collection of aCubes
         '''
         if self.parRep.mc.opt('grid', False):   # refrain from checking a cube is empty
             return True
+        if self.parRep.excl is not None and not self.parRep.excl.cut(c):
+            return False    # the cube is inside the regions (found after the cube creation) without new solutions
         # check, if after the cube creation a solution was insterted in the cube
         if not self.parRep.mc.opt('skipEmpty', True) or self.is_empty(c):
             # print(f'cube[{c_id}], size {c.size:.2f} is ok')
@@ -142,50 +390,31 @@ class Cubes:     # collection of aCubes
             # print(f'cube[{c_id}], size {c.size:.2f} rejected')
             return False    # the cube cannot be used
 
+    @timed('cubes')
     def select(self):    # select a cube for generating a new Pareto solution
         if len(self.cand) == 0:
             print(f'\nEmpty list of cubes: no more preferences can be defined.')
             return None
-        # print(f'cand-list before sorting: {self.cand}')
-        self.cand = sorted(self.cand, key=itemgetter(1), reverse=True)  # sort cand. id-list by decreasing cube-size
-        # print(f'after sorting {len(self.cand)}: {self.cand}')
-
-        # sub-list of candidates of the same size
-        lst = []    # list of cubes having the same size
-        id2prune = []
-        # size = self.cand[0][1]
-        for (c_id, c_size) in self.cand:
-            if  self.parRep.mc.opt('mCube', False) or  self.cand_ok(c_id):  # if 'mCube' option skip the cube check
-                lst.append(c_id)
+        n_cand = len(self.cand)     # number of candidates before the selection
+        best = None
+        while len(self.cand):   # take (and remove from candidates) the largest cube, until an empty cube is found
+            (c_id, c_size) = self.cand.pop()
+            # if 'mCube' or 'simplex' option skip the cube check
+            is_ok = self.parRep.mc.opt('mCube', False) or self.parRep.mc.opt('simplex', False) or self.cand_ok(c_id)
+            if self.boxes is not None:
+                self.boxes.remove(c_id)     # the cube is no longer a candidate
+            if is_ok:
+                best = self.get(c_id)
+                best.used = True
                 break   # take the first found empty-cube
-            else:
-                id2prune.append(c_id)
-                if self.parRep.cfg.get('verb') > 1:
-                    print(f'non-empty cube [{c_id}] skipped (will be pruned from the candidate list).')
+            elif self.parRep.cfg.get('verb') > 1:
+                print(f'non-empty cube [{c_id}] skipped (will be pruned from the candidate list).')
 
-        best = None
-        if len(lst) > 0:
-            best_id = lst[0]
-            best = self.get(best_id)
-            best.used = True
-            id2prune.append(best.id)
-            print(f'Best (of {len(self.cand)}) cube[{best.id}]: [{best.s1.itr_id}, {best.s2.itr_id}], '
-                  # f'size={best.size:.2f}, degen = {best.degen_str}; {len(lst) - 1} cubes of the same size remain.')
+        if best is not None:
+            print(f'Best (of {n_cand}) cube[{best.id}]: [{best.s1.itr_id}, {best.s2.itr_id}], '
                   f'size={best.size:.2f}, degen = {best.degen_str}.')
         else:
-            print(f'\nNo cube from {len(self.cand)} candidates is suitable for defining preferences.')
-        # prune the candidate list (the selected cube, and non-empty cubes)
-        for c_id in id2prune:
-            # print(f'\ncand-list before removing c_id = {c_id}: {self.cand}')
-            for item in self.cand:
-                i_id = item[0]
-                if i_id == c_id:
-                    self.cand.remove(item)
-                    # print(f'cube_id {c_id} removed from the candidate list.')
-                    break   # remove() destroys the list indexing, the loop must be re-entered
-                # else:
-                #     print(f'c_ind {i_id} skipped')
-            # print(f'after: {self.cand}\n')
+            print(f'\nNo cube from {n_cand} candidates is suitable for defining preferences.')
 
         # if len(self.sols) > 10:
         #     print(f'Iteration test-break')
@@ -202,22 +431,9 @@ class Cubes:     # collection of aCubes
         print(f'\t{len(self.cand)} cubes remain for exploration.')
         print(f'\t{self.small} small cubes ignored.')
         print(f'\t{self.filled} non-empty cubes ignored.')
-
-'''
-        print('\nList of cubes remaining for analysis (sorted by L^inf size):')
-        self.cand = sorted(self.cand, key=itemgetter(1), reverse=True)  # sort by size (just for the listing)
-        for (i, c) in enumerate(self.cand):     # self.cand is a []
-            c_id = c[0]
-            cube = self.get(c_id)
-            cube.lst(c_id)
-            cube.lst_size(c_id)
-        # use the below with care: the list might be very long
-        print('\nList of used cubes:')
-        for c_id, cube in self.all_cubes.items():     # self.all_cubes is a {}: (key_id, cube)
-            if cube.used:
-                cube.lst(c_id)
-                cube.lst_size(c_id)
-'''
+        if self.parRep.excl is not None:
+            print(f'\t{self.parRep.excl.n_skip} cubes (or sol-pairs) inside, and {self.parRep.excl.n_cut} cubes cut '
+                  f'by, {len(self.parRep.excl)} regions without new solutions.')
 
 
 # noinspection SpellCheckingInspection
@@ -241,11 +457,21 @@ class aCube:     # a Cube defined (in achievement values) by the given pair of n
         self.sizeLinf = 0.  # Linf (Tchebyshev)-norm size
         self.aspAch = []   # list of A values in Achievement scale (used to define self.asp/res)
         self.resAch = []   # list of R values in Achievement scale
+        self.a_cut = {}    # key: crit index, val: upper bound (achievement) of the edge cut by ExclRegs
+        self.mk_size()
 
-        # calculate the cube size, and distance components (diffs for each criterion)
+    def mk_size(self):  # calculate the cube size, and distance components (diffs for each criterion)
+        self.edges = []
+        self.degen = []
+        self.degen_str = ''
+        self.is_degen = False
+        self.sizeL1 = 0.
+        self.sizeL2 = 0.
+        self.sizeLinf = 0.
         ind_sep = ''
         deg_ind = 0
-        for (a1, a2) in zip(s1.a_vals, s2.a_vals):  # loop over achievements of criteria
+        for i in range(self.mc.n_crit):  # loop over achievements of criteria
+            (a1, a2) = self.a_ends(i)
             dist = abs(a1 - a2)
             self.sizeL1 += dist  # Manhattan (L1) distance in criteria scaled-values
             self.sizeL2 += dist * dist  # L2 distance
@@ -265,12 +491,36 @@ class aCube:     # a Cube defined (in achievement values) by the given pair of n
         # self.size = self.sizeL2     # cube size defined by L2
         self.size = self.sizeLinf   # cube size defined by Linf
 
+    def hv(self):   # hypervolume of the cube part, which can be added by a new solution (cube is empty)
+        return box_hv([[min(a, self.a_cut.get(i, a)) for (i, a) in enumerate(s.a_vals)] for s in self.verts()])
+
+    def verts(self):    # solutions defining the cube
+        return [self.s1, self.s2]
+
+    def a_ends(self, i):    # achievements (of the solutions defining the cube) spanning the i-th edge
+        cut = self.a_cut.get(i)
+        if cut is None:
+            return self.s1.a_vals[i], self.s2.a_vals[i]
+        return min(self.s1.a_vals[i], cut), min(self.s2.a_vals[i], cut)
+
+    def v_ends(self, i):    # crit. values (of the solutions defining the cube) spanning the i-th edge
+        cut = self.a_cut.get(i)
+        if cut is None:
+            return self.s1.vals[i], self.s2.vals[i]
+        cr = self.mc.cr[i]
+        return tuple(cr.ach2val(cut) if s.a_vals[i] > cut else s.vals[i] for s in [self.s1, self.s2])
+
+    def cut(self, a_max):   # cut the edges at the upper bounds a_max (achievements) of the part to be explored
+        for (i, val) in enumerate(a_max):
+            if val < max(self.a_ends(i)):
+                self.a_cut.update({i: float(val)})
+        self.mk_size()
+
     # define A/R values for splitting the cuboid (i.e., to find a new solution between s1 and s2)
     def setAR(self):
         for (i, cr) in enumerate(self.mc.cr):
             cr.is_ignored = None    # ignored can be only for selfish solutions
-            v1 = self.s1.vals[i]
-            v2 = self.s2.vals[i]
+            (v1, v2) = self.v_ends(i)
             if cr.eqBetter(v1, v2):  # s1 has better (or equal)crit. value than s2
                 cr.asp = v1
                 cr.res = v2
@@ -369,3 +619,24 @@ class aCube:     # a Cube defined (in achievement values) by the given pair of n
     def lst_size(self, c_ind):  # seq: externally defined seq_no of the list of cubes
         print(f'cube[{c_ind}], sol [{self.s1.itr_id:3d}, {self.s2.itr_id:3d}], '
               f'sizes: L1={self.sizeL1:.2e}, L2={self.sizeL2:.2e}, Linf={self.sizeLinf:.2e}, degen {self.degen_str}')
+
+
+# noinspection SpellCheckingInspection
+class aSimplex(aCube):     # a Cube spanned by the vertices (solutions) of a simplex of the PF triangulation
+    def __init__(self, mc, sols):
+        self.sols = sols    # solutions defining the simplex vertices
+        a_vals = np.array([s.a_vals for s in sols])
+        self.best = a_vals.argmax(axis=0).tolist()  # for each crit.: index of the vertex with the best achievement
+        self.worst = a_vals.argmin(axis=0).tolist()    # for each crit.: index of the vertex with the worst achievement
+        # s1, s2 (used for info) are the most distant (in L-inf) vertices
+        (i1, i2) = max(combinations(range(len(sols)), 2), key=lambda ij: np.abs(a_vals[ij[0]] - a_vals[ij[1]]).max())
+        super().__init__(mc, sols[i1], sols[i2])
+
+    def verts(self):
+        return self.sols
+
+    def a_ends(self, i):    # the i-th edge of the cube spans achievements of all vertices
+        return self.sols[self.best[i]].a_vals[i], self.sols[self.worst[i]].a_vals[i]
+
+    def v_ends(self, i):
+        return self.sols[self.best[i]].vals[i], self.sols[self.worst[i]].vals[i]
@@ -1,65 +1,95 @@
 import os.path	# needed for checking the stop request
-import sys		# needed for sys.exit()
-import pyomo.environ as pe
-from pyomo.opt import SolverStatus
-from pyomo.opt import TerminationCondition
 # from .ctr_mca import CtrMca  # handling MCMA structure and data, uses Crit class
 from .rd_inst import rd_inst  # model instance provider
 from .wrkflow import WrkFlow  # app's workflow
 from .mc_block import McMod  # generate the AF sub-model/block and link the core-model variables with AF variables
+from .solver import Solver, chk_sol  # solve the aggregate model (optionally through a persistent solver interface)
+from .pool import SolvPool  # solve batches of preferences by a pool of worker processes
+from .ckpt import Ckpt  # periodic checkpoints of the workflow state
+from .run_arch import RunArch  # solutions of the previous runs (for the same core model and criteria)
+from .memo import Memo  # solutions of the current run keyed by the quantized preferences
+from .warm import WarmStart  # warm starts of the optimizations for cubes from the parent solutions
+from .harvest import Harvest  # solutions of the MIP-solver pools added as extra Pareto candidates
 # from .par_repr import ParRep
 # from .report import Report  # organize results of each iteration into reports
 
 
-# noinspection SpellCheckingInspection
-def chk_sol(res):  # check status of the solution
-    # print(f'solver status: {res.solver.status}, termination condition: {res.solver.termination_condition}.')
-    if ((res.solver.status != SolverStatus.ok) or
-            (res.solver.termination_condition != TerminationCondition.optimal)):
-        print(f'optimization failed; termination condition: {res.solver.termination_condition}')
-        sys.stdout.flush()  # desired for assuring printing exception at the output end
-        '''
-        # non-optimal solutions are handled now, commented exceptions kept here in case they should be needed
-        if res.solver.termination_condition == TerminationCondition.infeasible:
-            raise Exception('Optimization problem is infeasible.')
-        elif res.solver.termination_condition == TerminationCondition.unbounded:
-            raise Exception('Optimization problem is unbounded.')
-        else:
-            raise Exception('Optimization failed.')
-        '''
-        return False     # optimization failed
-    else:
-        return True     # optimization OK
+def find_rec(caches, pref):     # return the solution record from the first cache answering the preferences (or None)
+    for cache in caches:
+        rec = cache.find(pref)
+        if rec is not None:
+            return rec
+    return None
 
 
 # noinspection SpellCheckingInspection
-def driver(cfg):
+def driver(cfg, resume=False):
     m1 = rd_inst(cfg)    # upload or generate m1 (core model)
     print(f'Generating Pareto-front representation of the core-model instance: {m1.name}.')
 
-    # initialize the WrkFlow
-    wflow = WrkFlow(cfg, m1)
-    verb = wflow.mc.verb
+    # initialize the WrkFlow, or restore it (together with the itr counter) from the last checkpoint
+    ckpt = Ckpt(cfg)
+    if resume:
+        wflow, n_iter, pending = ckpt.load(m1)
+    else:
+        wflow = WrkFlow(cfg, m1)
+        n_iter = 0
+        pending = []    # (preferences, solution) pairs solved by the pool, waiting for processing
 
-    # select solver (default glpk, other solvers can be selected in cfg.yml by: solver: solver_id
-    # glpk - solves LP and MIP; iopt - solves LP and NL, but not MIP; gams uses cplex (but with the interface overhead)
-    solver_id = wflow.mc.opt('solver', 'glpk')
-    print(f'Selected solver_id: {solver_id}')
-    opt = pe.SolverFactory(solver_id)
+    # select solver (default glpk), optionally used through its persistent interface (cfg option persistent)
+    solv = Solver(wflow, m1)
+    mc_gen = McMod(wflow, m1)  # McMod ctor (the MC-part model, i.e. the Achievement Function of MCMA)
+    # optional batches of preferences solved concurrently by a pool of worker processes (cfg options batch, nProc)
+    batch = wflow.mc.opt('batch', 1)    # max number of preferences in a batch
+    pool = None     # pool of workers, created when a batch is needed
+    # optional archive of solutions shared by the runs (cfg option runArch: dir of the archive files)
+    run_arch = None if wflow.mc.opt('runArch', None) is None else RunArch(wflow, solv.sol_vars)
+    # optional cache of the solutions of nearly identical preferences (cfg option memoTol)
+    memo = Memo(wflow) if wflow.mc.opt('memoTol', 0.) > 0. else None
+    caches = [cache for cache in [memo, run_arch] if cache is not None]     # sources of solutions without solving
+    # optional warm starts of the optimizations for cubes (cfg option warmStart)
+    warm = WarmStart(wflow, solv) if wflow.mc.opt('warmStart', False) else None
+    # optional harvesting of the solutions kept by the MIP solver (cfg option solPool)
+    harvest = Harvest(wflow, solv) if wflow.mc.opt('solPool', 0) > 0 else None
 
-    n_iter = 0
     max_itr = wflow.mc.opt('mxIter', 100)
     print(f'Maximum number of iterations: {max_itr}')
+    wflow.tm.activate()     # start timing the phases of itrs
     while n_iter <= max_itr:   # just for safety; should not be needed for a proper stop criterion
         # i_stage = mc.set_stage()  # define/check current analysis stage
         print(f'\nStart iteration {n_iter}, analysis stage {wflow.cur_stage} -----------------------------------------')
         if n_iter == 6:
             print(f'\niter {n_iter}: trap0')
             pass
-        i_stage = wflow.itr_start(n_iter)   # set preferences, return current stage
+        pref = None  # preferences of the solution provided by the pool
+        rec = None  # solution values provided by the pool
+        if len(pending) == 0 and batch > 1 and wflow.batch_ok():     # solve the next batch by the pool
+            prefs = wflow.batch_pref(n_iter, min(batch, max_itr - n_iter))
+            recs = [find_rec(caches, pref) for pref in prefs]    # solutions available without solving
+            to_solve = [pref for (pref, rec) in zip(prefs, recs) if rec is None]
+            if len(to_solve):
+                if pool is None:
+                    pool = SolvPool(wflow, wflow.mc.opt('nProc', min(batch, os.cpu_count())))
+                solved = pool.solve(to_solve)
+                for cache in caches:
+                    for (pref, rec) in zip(to_solve, solved):
+                        cache.add(pref, rec)
+                solved = iter(solved)
+                recs = [next(solved) if rec is None else rec for rec in recs]
+                print(f'Batch of {len(to_solve)} preferences solved by the pool.')
+            pending = list(zip(prefs, recs))
+        if len(pending):    # the solution was already computed, restore its preferences
+            pref, rec = pending.pop(0)
+            i_stage = wflow.set_pref(n_iter, pref)
+        elif wflow.cur_stage == 6:  # set by batch_pref() (through itr_start()): no more preferences
+            i_stage = 6
+        else:
+            i_stage = wflow.itr_start(n_iter)   # set preferences, return current stage
         if i_stage == 6:   # cur_stage is set to 6 (by par_pref() or set_pref()), if all preferences are processed
             print(f'\nFinished the analysis for all generated/specified preferences.')
             break       # exit the iteration loop
+        cache_pref = None if len(caches) == 0 or pref is not None else wflow.get_pref()
+        cache_rec = None if cache_pref is None else find_rec(caches, cache_pref)    # solution without solving
 
         '''
         if i_stage > 3 and mc.is_par_rep and mc.par_rep is None:    # init ParRep() (must be after payOff table done)
@@ -80,30 +110,36 @@ def driver(cfg):
         # print(f'\nGenerating instance of the MC-part model (representing the MCMA Achievement Function).')
         '''
 
-        m = pe.ConcreteModel()  # model instance to be composed of two blocks: (1) core model and (2) mc_part
-        m.add_component('core_model', m1)  # m.m1 = m1  assign works but (due to warning) replaced by add_component()
-        mc_gen = McMod(wflow, m1)  # McMod ctor (the MC-part model, i.e. the Achievement Function of MCMA)
-        mc_part = mc_gen.mc_itr()   # concrete model of the MC-part (based on the current preferences)
+        mc_part = mc_gen.mc_itr()   # concrete model of the MC-part (updated for the current preferences)
         if mc_part is None:
             print(f'\nThe defined preferences cannot be used for defining the mc-block')
             print('Optimization problem not generated.     ---------------------------------------------------------')
             wflow.mc.is_opt = False
+        elif pref is not None:  # solution provided by the pool
+            wflow.mc.is_opt = rec is not None
+            if wflow.mc.is_opt:
+                solv.set_rec(rec, mc_part)
+        elif cache_rec is not None:  # solution provided by the cache or the archive
+            wflow.mc.is_opt = True
+            solv.set_rec(cache_rec, mc_part)
         else:
             # print('mc-part generated.\n')
             # mc_part.pprint()
-            m.add_component('mc_part', mc_part)  # add_component() used instead of simple assignment
-            if verb > 3:
-                print('core-model and mc-part blocks added to the model instance; ready for optimization.')
-                m.pprint()
-
             # solve the model instance composed of two blocks: (1) core model m1, (2) MC-part (Achievement Function)
             # print('\nsolving --------------------------------')
-            # results = opt.solve(m, tee=True)
-            results = opt.solve(m, tee=False)
+            results = solv.solve(mc_part, warm is not None and warm.set_start())
             # todo: clarify exception (uncomment next line) while loading the results
             #   maybe m1 should be replaced by m? Also consider to move this after checking optimality
             # m1.load(results)  # Loading solution into results object
             wflow.mc.is_opt = chk_sol(results)  # solution status: True, if optimal, False otherwise
+            if len(caches) and wflow.mc.is_opt:
+                rec = solv.get_rec(mc_part)
+                for cache in caches:
+                    cache.add(cache_pref, rec)
+            if warm is not None and wflow.mc.is_opt:
+                warm.add(n_iter)    # n_iter is also the id of the solution
+            if harvest is not None and wflow.mc.is_opt:
+                harvest.collect()
 
         # print('processing solution ----')
         if wflow.mc.is_opt:
@@ -112,14 +148,18 @@ def driver(cfg):
                 # wflow.par_rep.solDistr()
                 pass
             i_stage = wflow.itr_sol(mc_part)  # process solution, set next stage in wflow, and return it
+            if harvest is not None:
+                harvest.add(n_iter)     # after the optimal solution (the pool solutions share its id)
             # if n_iter < 20 and i_stage > 3:
             #     wflow.par_rep.solDistr()
             #     pass
         else:
             print(f'\niter {n_iter}: optimization failed, solution disregarded.        -------------------------------')
         # rep.itr(mc_part)  # driver for sol-processing: update crit. attr., store sol, check domination & close sols
-        m.del_component(m.core_model)  # must be deleted (otherwise m1 would have to be generated at every iteration)
-        # m.del_component(m.mc_part)   # need not be deleted (a new mc_part needs to be generated for new preferences)
+        if len(pending) and not wflow.pref_ok(pending[0][0]):     # e.g., reset after nadir update
+            print(f'Stage changed: {len(pending)} solutions computed in the batch disregarded.')
+            pending = []
+        wflow.tm.itr_end(n_iter)     # store times of phases of the current itr
 
         # print(f'Finished current itr, count: {n_iter}.')
         if i_stage == 6:   # cur_stage is set to 6 (by par_pref() or set_pref()), if all preferences are processed
@@ -133,9 +173,25 @@ def driver(cfg):
         if os.path.exists(stop_file):
             print(f"\nIteration break requested through file '{stop_file}' after {n_iter} itrs.")
             break
+        if ckpt.chk(wflow, n_iter, pending) and run_arch is not None:   # store checkpoint, if due
+            run_arch.save()     # the archive is stored together with the checkpoints
     # the iteration loop ends here
+    if pool is not None:
+        pool.close()
+    if run_arch is not None:
+        run_arch.save()
+        run_arch.summary()
+    if memo is not None:
+        memo.summary()
+    if warm is not None:
+        warm.summary()
+    if harvest is not None:
+        harvest.summary()
 
     print(f'\nFinished {n_iter} analysis iterations. Summary report follows.')
 
     # reports
     wflow.rep.summary()   # generate data-frames and store them as csv
+    wflow.tm.summary(f'{cfg.get("resDir")}timings.csv')    # store times of phases of itrs and print their summary
+
+    return wflow    # used for collecting statistics of the run (e.g., by bench)
@@ -4,6 +4,7 @@
 # import operator
 from itertools import combinations  #, permutations
 from operator import itemgetter
+from .timing import timed  # timing of the iteration phases
 
 # from .cube import ParSol, Cubes, aCube
 # from .corners import Corners
@@ -35,18 +36,20 @@ class Grid:     # representation of the neighbors
             pass
 
         def getSol(self, idSol):  # return the L^inf distance between the sol-pairs
-            for s in self.sols:
-                if s.itr_id == idSol:
-                   return s
+            s = self.sols.get(idSol)
+            if s is not None:
+                return s
             # raise Exception(f'Grid::getSol() - solution with id {id} not found.')
             raise Exception(f'Grid::getSol() - solution with id {idSol} not found.')
 
         def dist(self, id1, id2):  # return the L^inf distance between the sol-pairs
             p1 = self.getSol(id1)
             p2 = self.getSol(id2)
+            a1 = p1.a_vals
+            a2 = p2.a_vals
             val = 0.
             for i in range(self.grid.mc.n_crit):
-                val = max(val, abs(p1.a_vals[i] - p2.a_vals[i]))
+                val = max(val, abs(a1[i] - a2[i]))
             # print(f'p1 = {id1}, p2 = {id2}, L^inf dist = {val:.2f}')
             return val
 
@@ -280,6 +283,7 @@ class Grid:     # representation of the neighbors
     # Returns nothing.
     # Access to pairs through the self.getPair() that returns either a pair of solutions' ids to be used
     # for defining a next cube or (None, None) if there are no more pairs to be used for defining a cube
+    @timed('neigh')
     def addSol(self, s=None, was_close=False):  # add a Pareto solution
         if was_close:    # the last solution was close (not included in the PF); find a pair from previous solutions
             if self.verb > 2:
@@ -300,6 +304,7 @@ class Grid:     # representation of the neighbors
         return self.wFlow()
 
     # return indices of the solution-pair selected for making a next cube
+    @timed('neigh')
     def getPair(self):
         return self.lastPair
 
@@ -369,6 +374,10 @@ class Grid:     # representation of the neighbors
             if is_used:     # should not happen, but just in case...
                 # raise Exception(f'Grid::selCand() - pair of sols ({id0}, {id1}) was already used.')
                 continue    # skip (probably a gap, see Grid::mkCand above)
+            pts = [self.sols.get(id0), self.sols.get(id1)]
+            if self.parRep.excl is not None and None not in pts and self.parRep.excl.skip([s.a_vals for s in pts]):
+                self.done.update({(id0, id1): diff})    # the pair is inside a region without new solutions
+                continue
             self.lastPair = (id0, id1)
             self.lastRay = seq_ray
             self.done.update({self.lastPair: diff})
@@ -0,0 +1,73 @@
+"""
+Harvest the feasible solutions found by the MIP solver during the optimizations for cubes (option solPool)
+"""
+import pyomo.environ as pe
+from pyomo.contrib.appsi.solvers.highs import Highs
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+class Harvest:
+    """criteria values of the (not optimal) feasible solutions kept by the MIP solver, added as extra Pareto candidates.
+
+    The branch-and-bound of MIP solvers finds, besides the optimal solution, other feasible solutions, some of them
+    non-dominated and distant from the known Pareto solutions. Up to solPool of such solutions are taken after each
+    optimization for a cube: from the improving solutions saved by HiGHS (appsi_highs), or from the solution pool of
+    Gurobi (gurobi_direct, gurobi_persistent). Only the criteria values are available for these solutions; therefore
+    they have no rows in the reports of the itrs and model vars; their ids (assigned by ParRep.addPool()) start from
+    POOL_ID0. Used only for the cubes of the default mode (mCube, grid, and simplex keep their own structures).
+    """
+    def __init__(self, wflow, solv):
+        self.wflow = wflow  # WrkFlow object
+        self.solv = solv    # Solver object
+        self.mc = wflow.mc  # CtrMca object
+        self.mx_sols = self.mc.opt('solPool', 0)    # max number of the pool solutions taken from each optimization
+        self.kind = None    # interface to the pool: 'highs' or 'gurobi' (None: harvesting not used)
+        self.cr_vars = []   # core-model vars of the criteria
+        self.vals = []      # crit values of the pool solutions of the last optimization
+        self.n_pool = 0     # number of the pool solutions taken
+        self.n_add = 0      # number of the pool solutions added to the Pareto set representation
+        if any(self.mc.opt(mode, False) for mode in ['mCube', 'grid', 'simplex']):
+            print(f'WARNING: solution pools are used only in the default mode of cubes; the solPool option ignored.')
+            return
+        opt = solv.opt
+        if isinstance(opt, Highs):
+            opt.options.update({'mip_improving_solution_save': True})
+            self.kind = 'highs'
+        elif solv.solver_id in ['gurobi_direct', 'gurobi_persistent']:
+            opt.options.update({'PoolSolutions': self.mx_sols + 1})   # the optimal solution is also in the pool
+            self.kind = 'gurobi'
+        else:
+            print(f'WARNING: solution pool of solver "{solv.solver_id}" not available; the solPool option ignored.')
+            return
+        m1_vars = solv.m1.component_map(ctype=pe.Var)  # all variables of the m1 (core model)
+        self.cr_vars = [m1_vars[cr.var_name] for cr in self.mc.cr]
+        print(f'Up to {self.mx_sols} solutions of the solver pool harvested from each optimization for a cube.')
+
+    @timed('harvest')
+    def collect(self):  # store the crit values of the pool solutions of the last optimization
+        self.vals = []
+        par_rep = self.wflow.par_rep
+        if self.kind is None or self.wflow.cur_stage != 4 or par_rep is None or par_rep.cur_cube is None:
+            return
+        opt = self.solv.opt
+        if self.kind == 'highs':
+            cols = [opt._pyomo_var_to_solver_var_map[id(var)] for var in self.cr_vars]
+            sols = opt._solver_model.getSavedMipSolutions()[:-1]   # the last saved solution is the optimal one
+            self.vals = [[sol.col_value[col] for col in cols] for sol in sols[-self.mx_sols:]]
+        else:
+            model = opt._solver_model
+            g_vars = [opt._pyomo_var_to_solver_var_map[var] for var in self.cr_vars]
+            for k in range(1, min(model.SolCount, self.mx_sols + 1)):  # solution 0 is the optimal one
+                model.Params.SolutionNumber = k
+                self.vals.append([g_var.Xn for g_var in g_vars])
+        self.n_pool += len(self.vals)
+
+    @timed('harvest')
+    def add(self, itr_id):  # add the collected solutions to the Pareto set representation
+        if len(self.vals) and self.wflow.cur_stage == 4:    # e.g., the pool is disregarded after a reset
+            self.n_add += self.wflow.par_rep.addPool(itr_id, self.vals)
+        self.vals = []
+
+    def summary(self):
+        print(f'Solution pools: {self.n_add} out of {self.n_pool} pool solutions added to the Pareto set.')
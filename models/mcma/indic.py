@@ -0,0 +1,142 @@
+"""
+Quality indicators of the Pareto-front representation (hypervolume, spacing) updated for each new solution
+"""
+import numpy as np
+from .sol_arch import UNIQUE
+
+
+def non_dom(pts, chunk=16):  # return the non-dominated (maximized) rows of pts, without duplicates
+    pts = pts[np.argsort(-pts.sum(axis=1), kind='stable')]    # dominating points precede the dominated ones
+    keep = pts[:0]
+    while len(pts):     # the first chunk of the remaining points is checked within the chunk
+        blk = pts[:chunk]
+        dom = np.all(blk[:, None, :] >= blk[None, :, :], axis=2)    # dom[j, i]: blk[j] dominates (or equals) blk[i]
+        dom &= np.any(blk[:, None, :] > blk[None, :, :], axis=2) | np.tri(len(blk), k=-1, dtype=bool).T  # 1st of equal
+        blk = blk[~dom.any(axis=0)]
+        keep = np.vstack([keep, blk])
+        pts = pts[chunk:]   # the remaining points dominated by the new kept points are dropped
+        pts = pts[~np.all(blk[:, None, :] >= pts[None, :, :], axis=2).any(axis=0)]
+    return keep
+
+
+def hv_exact(pts):  # hypervolume of the pts (maximized, reference point at 0) by slicing; pts may be dominated
+    if len(pts) == 0:
+        return 0.
+    if pts.shape[1] == 1:
+        return float(pts[:, 0].max())
+    if pts.shape[1] == 2:   # sweep by the decreasing 1st coordinate, the dominated points add nothing
+        pts = pts[np.argsort(-pts[:, 0], kind='stable')]
+        y_mx = np.maximum.accumulate(pts[:, 1])
+        return float(np.sum(pts[:, 0] * np.diff(y_mx, prepend=0.)))
+    pts = pts[np.argsort(-pts[:, -1], kind='stable')]   # slices between the values of the last coordinate
+    z = np.append(pts[:, -1], 0.)
+    vol = 0.
+    for k in range(len(pts)):
+        if z[k] > z[k + 1]:
+            vol += (z[k] - z[k + 1]) * hv_exact(pts[:k + 1, :-1])
+    return vol
+
+
+# noinspection SpellCheckingInspection
+class Indic:
+    """hypervolume and spacing of the current Pareto solutions (ParRep.sols), updated incrementally.
+
+    The hypervolume (in achievements, reference point at the Nadir, normalized by the volume of the [N, U] box) grows
+    by the exclusive contribution of each new Pareto solution p, i.e., prod(p) less the hypervolume of the points
+    min(p, s) for the solutions s; the latter is computed exactly for up to 4 criteria, and by the Monte-Carlo
+    estimate (hvSamples points sampled in the [0, p] box) for more criteria. Removal of solutions dominated by p does
+    not change the hypervolume.
+    The spacing is the standard deviation of the L-inf distances between each solution and its nearest neighbor.
+    """
+    def __init__(self, parRep, size=256):
+        self.parRep = parRep    # PF representation object
+        self.mc = parRep.mc     # CtrMca object
+        self.arch = parRep.arch     # SolArch object
+        self.n_crit = self.mc.n_crit
+        self.scale = 100. ** self.n_crit   # volume of the achievements range
+        self.n_samples = self.mc.opt('hvSamples', 10000)   # number of MC samples (used for more than 4 criteria)
+        self.rng = np.random.default_rng(0)     # fixed seed: reproducible estimates
+        self.hv = 0.    # normalized hypervolume of the solutions
+        self.nn_dist = np.full(size, np.inf)    # distance to the nearest solution (indexed by the arch rows)
+        self.nn_row = np.full(size, -1, dtype=np.int64)    # row of the nearest solution (-1: none)
+        self.trace = []     # [itr_id, hv] for each itr of the PF computation
+        self.hv_stop = self.mc.opt('hvStop', 0.)    # min relative hv gain over the hvWin itrs (0: not used)
+        self.hv_win = self.mc.opt('hvWin', 20)  # number of itrs (sliding window) for the hvStop rule
+
+    def alive(self, row):     # return rows of the solutions in ParRep.sols, except row
+        rows = np.flatnonzero(self.arch.state[:self.arch.n_sols] == UNIQUE)
+        return rows[rows != row]
+
+    def add(self, s):   # update the indicators by the new Pareto solution s (already included in ParRep.sols)
+        n_new = len(self.arch.itr_id) - len(self.nn_dist)
+        if n_new > 0:   # resize the arrays to the arch size
+            self.nn_dist = np.concatenate([self.nn_dist, np.full(n_new, np.inf)])
+            self.nn_row = np.concatenate([self.nn_row, np.full(n_new, -1, dtype=np.int64)])
+        rows = self.alive(s.row)
+        a_vals = np.maximum(self.arch.a_vals[s.row], 0.)
+        others = np.maximum(self.arch.a_vals[rows], 0.)
+        self.hv += self.contrib(a_vals, others) / self.scale
+        if len(rows) == 0:
+            return
+        dist = np.abs(others - a_vals).max(axis=1)
+        closer = dist < self.nn_dist[rows]
+        self.nn_dist[rows[closer]] = dist[closer]
+        self.nn_row[rows[closer]] = s.row
+        ind = int(dist.argmin())
+        self.nn_dist[s.row] = dist[ind]
+        self.nn_row[s.row] = rows[ind]
+
+    def remove(self, s):    # find the nearest solutions for the solutions having the removed s as the nearest
+        self.nn_dist[s.row] = np.inf
+        self.nn_row[s.row] = -1
+        rows = self.alive(s.row)
+        for row in rows[self.nn_row[rows] == s.row]:
+            other = rows[rows != row]
+            if len(other) == 0:
+                self.nn_dist[row] = np.inf
+                self.nn_row[row] = -1
+                continue
+            dist = np.abs(self.arch.a_vals[other] - self.arch.a_vals[row]).max(axis=1)
+            ind = int(dist.argmin())
+            self.nn_dist[row] = dist[ind]
+            self.nn_row[row] = other[ind]
+
+    def contrib(self, p, others):   # hypervolume dominated by p only (not by the others)
+        vol = float(np.prod(p))
+        if vol == 0. or len(others) == 0:
+            return vol
+        q = non_dom(np.minimum(others, p))  # parts of the [0, p] box dominated by the others
+        if self.n_crit <= 4:
+            return vol - hv_exact(q)
+        pts = self.rng.random((self.n_samples, self.n_crit)) * p    # MC estimate
+        covered = np.zeros(self.n_samples, dtype=bool)
+        for qi in q:
+            covered |= np.all(pts <= qi, axis=1)
+        return vol * (1. - covered.mean())
+
+    def spacing(self):  # standard deviation of the distances to the nearest solution
+        rows = self.parRep.sols.rows()
+        if len(rows) < 2:
+            return 0.
+        return float(np.std(self.nn_dist[rows], ddof=1))
+
+    def log(self, itr_id):  # store the indicators of the itr (in its row of iters.csv), and in the trace
+        itr_buf = self.parRep.wflow.rep.itr_buf
+        itr_buf.set('hv', self.hv)
+        itr_buf.set('spacing', self.spacing())
+        if self.parRep.wflow.cur_stage != 4:
+            return
+        if len(self.trace) and self.trace[-1][0] == itr_id:    # the itr solution added again
+            self.trace[-1][1] = self.hv
+        else:
+            self.trace.append([itr_id, self.hv])
+
+    def stop(self):     # return True, if the relative hv gain over the last hvWin itrs is below hvStop
+        if self.hv_stop <= 0. or len(self.trace) <= self.hv_win or self.hv <= 0.:
+            return False
+        gain = (self.hv - self.trace[-1 - self.hv_win][1]) / self.hv
+        if gain < self.hv_stop:
+            print(f'\nHypervolume {self.hv:.4f} increased by {gain:.2e} (less than hvStop {self.hv_stop:.1e}) '
+                  f'during the last {self.hv_win} itrs.')
+            return True
+        return False
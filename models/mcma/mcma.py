@@ -24,6 +24,7 @@ def read_args():
     python mcma.py -h
     python mcma.py --install
     python mcma.py --anaDir analysis_folder
+    python mcma.py --anaDir analysis_folder --resume
     """
 
     parser = argparse.ArgumentParser(
@@ -32,8 +33,10 @@ def read_args():
     # noinspection SpellCheckingInspection
     instal = "--install : \n    install folders with templates."
     anaDir = "--anaDir string :\n    define analysis directory."
+    resume = "--resume : \n    continue the analysis from the last checkpoint."
     parser.add_argument("--install", action="store_true", help=instal)  # on/off flag
     parser.add_argument("--anaDir", help=anaDir)
+    parser.add_argument("--resume", action="store_true", help=resume)  # on/off flag
 
     # parse cli
     cl_args = parser.parse_args()
@@ -111,11 +114,11 @@ def main():
         fn_out = f'{cfg.get("resDir")}{fn_name}'  # path to the file for redirected stdout
         # assert not os.path.exists(fn_out), f'Rename/remove the already used file: {fn_out}'
         print(f'Stdout redirected to: "{fn_out}".')
-        f_out = open(fn_out, 'w')
+        f_out = open(fn_out, 'a' if args.resume else 'w')   # append to the output of the resumed run
         sys.stdout = f_out
         print(f'User-defined cfg-options:\n{config.usrOptions}')
 
-    driver(cfg)  # driver and all needed objects of classes get all needed params from the cfg dict
+    driver(cfg, args.resume)  # driver and all needed objects of classes get all needed params from the cfg dict
 
     tend = dt.now()
     print('\nStarted at: ', str(tstart))
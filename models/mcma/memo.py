@@ -0,0 +1,59 @@
+"""
+Cache of the solutions of the current run keyed by the quantized preferences (option memoTol)
+"""
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+class Memo:
+    """solutions (records of the solution values) of the preferences computed in the current run.
+
+    The key of preferences is made of the activity (active, ignored, fixed) and of the A/R values (in achievements,
+    rounded to multiples of memoTol) of each criterion; preferences having the same key as already solved ones (e.g.,
+    nearly identical cubes made from different solution pairs, typically after resets and for MIP core models) are
+    answered by the stored solution without solving; such solutions are (as when solved) close to, or equal to, an
+    already found solution.
+    """
+    def __init__(self, wflow):
+        self.wflow = wflow  # WrkFlow object
+        self.mc = wflow.mc  # CtrMca object
+        self.tol = self.mc.opt('memoTol', 0.)    # quantum of the A/R achievements
+        self.recs = {}      # key: quantized preferences, val: record of the solution values
+        self.n_hit = 0      # number of preferences answered from the cache
+        self.n_miss = 0     # number of solved preferences (of stages > 1)
+
+    def key(self, pref):    # return the quantized preferences (made by WrkFlow.get_pref()), None for the payoff table
+        if pref.get('stage') < 2:
+            return None
+        items = [pref.get('stage'), pref.get('reset'), self.mc.deg_exp]     # achievements change with the reset
+        for (cr, (act, ign, fixed, asp, res)) in zip(self.mc.cr, pref.get('cr')):
+            items.append((act, ign, fixed, self.quant(cr, asp), self.quant(cr, res)))
+        return tuple(items)
+
+    def quant(self, cr, val):   # return the achievement of the val as an integer multiple of self.tol
+        if val is None:
+            return None
+        return int(round(float(cr.vals2ach(val)) / self.tol))
+
+    @timed('memo')
+    def find(self, pref):   # return the stored record answering the preferences (None, if not available)
+        key = self.key(pref)
+        rec = None if key is None else self.recs.get(key)
+        if rec is not None:
+            self.n_hit += 1
+            print(f'Solution of nearly identical preferences taken from the cache ({self.n_hit} cache hits).')
+        return rec
+
+    @timed('memo')
+    def add(self, pref, rec):   # store the record of the solution computed for the preferences
+        key = self.key(pref)
+        if key is None or rec is None:
+            return
+        self.n_miss += 1
+        self.recs.setdefault(key, rec)
+
+    def summary(self):
+        n_req = self.n_hit + self.n_miss
+        rate = 100. * self.n_hit / n_req if n_req else 0.
+        print(f'Preferences cache (memoTol {self.tol}): {self.n_hit} hits out of {n_req} preferences ({rate:.1f}%), '
+              f'{len(self.recs)} solutions stored.')
@@ -2,7 +2,11 @@
 # import pandas as pd
 # from numpy.ma.core import append
 # import operator
+import bisect
 from operator import itemgetter
+import numpy as np
+from .timing import timed  # timing of the iteration phases
+from .cube import box_hv
 
 # from .cube import ParSol, Cubes, aCube
 # from .corners import Corners
@@ -18,7 +22,11 @@ class Neigh:     # representation of the neighbors
         #
         self.points = {}         # key - solution id, val - vector of achievements
         self.points2 = []        # self.points converted to a list (to easy sorting)
-        self.solSort = []        # self.points2 sorted for each criterion by increasing achievements
+        self.solSort = [[] for _ in range(self.mc.n_crit)]  # self.points2 sorted for each crit. by increasing achiev.
+        self.srtKeys = [[] for _ in range(self.mc.n_crit)]  # keys (achiev., seq_no in points2) of the solSort items
+        self.scans = [{} for _ in range(self.mc.n_crit)]    # results of scanPairs(): key - seq_no of the left pt
+        # for each crit.: row (seq_no of the point) of keys (achiev., seq_no) of the point and of the scan end
+        self.scanEnd = [np.zeros((256, 4)) for _ in range(self.mc.n_crit)]
         self.neighCube = {}      # neighbors for generating cubes: key - ids of (sol1, sol2, crit), tmp dist in i-th crit
         self.neighDist = {}      # neighbors for calculating the distribution
         self.distances = []      # values of distances between neighbors (for each criterion separately)
@@ -30,6 +38,7 @@ class Neigh:     # representation of the neighbors
         self.lastPair = (None, None)    # ids of the lastly selected solution pair (of most distant neighbors)
         self.gap = self.parRep.mc.opt('mxGap', 10)  # the max gap between neighbors
         self.achDiff = 0.05 * self.gap  # tolerance for diffentiating achievements
+        self.prio = self.mc.opt('cubePrio', 'size')    # priority of the candidate pairs: size, or hv (hypervolume)
         self.verbose = 2    # print verbosity level
         #
         self.addSol()       # initialize the neighbors by selfish (and optionally neutral) solutions
@@ -41,6 +50,7 @@ class Neigh:     # representation of the neighbors
     # The only return point; returns nothing.
     # The self.getPair() returns either a pair of solutions' ids to be used for defining
     # a next cube or (None, None) if there are no more pairs to be used for defining a cube
+    @timed('neigh')
     def addSol(self, s=None, was_close=False):  # add a Pareto solution
         if was_close:    # the last solution was close (not included in tthe PF); find a pair from previous solutions
             if self.verbose > 2:
@@ -49,15 +59,9 @@ class Neigh:     # representation of the neighbors
         elif s is None:   # initial call, use the corner, optionally also neutral, solutions
             print(f'Neigh::addSol(): the ctor initialized with corner (and optionally, neutral) solutions.')
             for s1 in self.sols:
-                self.points.update({s1.itr_id: s1.a_vals})
-                tmp = s1.a_vals.copy()
-                tmp.insert(0, s1.itr_id)    # for convenience, put itr_id in front of each item
-                self.points2.append(tmp)
+                self.addPt(s1)
         else:
-            self.points.update({s.itr_id: s.a_vals})
-            tmp = s.a_vals.copy()
-            tmp.insert(0, s.itr_id)    # for convenience, put itr_id in front of each item
-            self.points2.append(tmp)
+            self.addPt(s)
         print(f'Neigh::addsol(): there are {len(self.points)} solutions, {len(self.done)} pairs done.')
         # raise Exception(f'Neigh::addSol() - not implemented yet.')
         if len(self.cand):
@@ -78,6 +82,7 @@ class Neigh:     # representation of the neighbors
         return  # the pair of solution ids (for defining a cube) is available by self.getPair()
 
     # return indices of the solution-pair selected for making a next cube
+    @timed('neigh')
     def getPair(self):
         return self.lastPair
 
@@ -106,92 +111,104 @@ class Neigh:     # representation of the neighbors
 
     # end of helpers
 
-    # mk pair(s) (for cube generation) for k-th sol/pt and i-th crit.; achiev: sorted (for i-th crit) achievements
-    def mkPairs(self):
-        # sort points by increasing achievements for each criterion separately
+    # add the point (solution) to the lists sorted for each criterion; drop the stale results of scanPairs()
+    def addPt(self, s):
+        a_vals = s.a_vals
+        self.points.update({s.itr_id: a_vals})
+        tmp = a_vals.copy()
+        tmp.insert(0, s.itr_id)    # for convenience, put itr_id in front of each item
+        seq = len(self.points2)     # seq_no of the point (orders points of equal achievements)
+        self.points2.append(tmp)
+        if seq == len(self.scanEnd[0]):     # double the size of the arrays
+            for i in range(self.mc.n_crit):
+                self.scanEnd[i] = np.concatenate([self.scanEnd[i], np.zeros(self.scanEnd[i].shape)])
         for i in range(self.mc.n_crit):
-            tmp = sorted(self.points2, key=itemgetter(i + 1), reverse=False)    # sort in ascending order
-            self.solSort.append(tmp)
+            key = (tmp[i + 1], seq)
+            pos = bisect.bisect(self.srtKeys[i], key)
+            self.srtKeys[i].insert(pos, key)
+            self.solSort[i].insert(pos, tmp)
+            # the scan from the k-th point examines points up to its end-key (inf, if up to the last point)
+            n = seq
+            start = self.scanEnd[i][:n, 0:2]
+            end = self.scanEnd[i][:n, 2:4]
+            after = (start[:, 0] < key[0]) | ((start[:, 0] == key[0]) & (start[:, 1] < key[1]))
+            before = (key[0] < end[:, 0]) | ((key[0] == end[:, 0]) & (key[1] < end[:, 1]))
+            for seq1 in np.flatnonzero(after & before):
+                self.scans[i].pop(int(seq1), None)
+            self.scanEnd[i][seq] = [key[0], seq, -np.inf, -1]   # no scan results for the new point
+
+    # find pairs (for cube generation) with the k-th point of the list sorted by the i-th crit. achievements
+    def scanPairs(self, i, k):
+        # return: (key and diff of the next point), list of [key, pair, diff] of the pairs, end-key of the scan
+        achiev = self.solSort[i]        # achievements sorted for i-th criterion in ascending order
+        p1 = achiev[k]
+        nbr = None      # key and diff of the next point
+        found = []      # pairs suitable for cube generation
+        id1 = p1[0]         # id (solution itr_id) of the left pt in the sought pair
+        ach1 = p1[i + 1]    # i-th crit. achievement of the p1
+        j = k + 1   # index of the current candidate sol (for a pair with k-th sol), starts with the next to k-th
+        phase1 = True   # skip pts with ach. close to k-th (next phase: add points close to first better enough)
+        phaseStr = 'phase1'
+        achOK = None    # ach of the distant pt
+        while j < len(achiev):
+            p2 = achiev[j]
+            id2 = p2[0]
+            ach2 = p2[i + 1]
+            diff = ach2 - ach1
+            pair = self.sortPair([id1, id2])
+            key = (pair[0], pair[1], i)
+            # todo: collect info on gaps (see pipaMac/xGap, itrs>=70 resulting in sols close to the cube-corners)
+            if j == k + 1:  # use all neighbors of the i-th criterion
+                nbr = (key, diff)   # neighbor data for distribution info
+            j += 1
+            # check, if the current point is OK for the pair with k-th pt
+            if phase1:  # looking for the first pt distant enough from k-th pt
+                # isOK = diff > self.gap    # this skips neighbor closer than the gap
+                isOK = diff > self.achDiff
+                if isOK:    # first pair with k-th pt, use it and move to phase2
+                    phase1 = False     # start phase2, i.e., looking for pt close to the first distant pt
+                    phaseStr = 'phase2'
+                    achOK = ach2       # achivement OK for the second phase
+                    if self.verbose > 4:
+                        print(f'pair {key}, diff {diff:.2f}: move to phase2')
+                else:
+                    if self.verbose > 4:
+                        print(f'{phaseStr}, pt {id1}, {ach1:.2f}: skipping too close pt {id2}, ach {ach2:.2f}: '
+                              f'checking next pt.')
+                    continue    # look for the first pt distant enough from p1
+            else:       # phase2: look for a pt close to the right pt of the first pair with k-th pt
+                if abs(achOK - ach2) < self.achDiff:
+                    isOK = True     # current point close enough to the first distant pt
+                else:
+                    if self.verbose > 4:
+                        print(f'{phaseStr}, skipping pt {id2}, ach {ach2:.2f}: too distant to {achOK:.2f}, '
+                              f'checking next pt.')
+                    return nbr, found, self.srtKeys[i][j - 1]   # no (more) suitable pair(s) with k-th point
+            if self.verbose > 4:
+                print(f'{phaseStr}, {key}, diff {diff:.2f}, isOK {isOK}')
+            found.append([key, pair, diff])     # found pt suitable for the cube-generation pair
+            # try next pt to make a pair with k-th sol.
+        return nbr, found, (np.inf, np.inf)     # all points up to the last were examined
 
+    # mk pair(s) (for cube generation) for k-th sol/pt and i-th crit.; achiev: sorted (for i-th crit) achievements
+    def mkPairs(self):
+        # points are sorted by increasing achievements for each criterion separately (by self.addPt())
         for i in range(self.mc.n_crit):     # loop over criteria
             achiev = self.solSort[i]        # achievements sorted for i-th criterion in ascending order
-            # jLast = 0   # seq of the last-used right point
             for k, p1 in enumerate(achiev):     # k: current seq-no of p1, p1: left pt of the pair with j (to be found)
                 if k == len(achiev) - 1:
                     break    # nothing to be done for the last point; process the next criterion
-                id1 = p1[0]         # id (solution itr_id) of the left pt in the sought pair
-                ach1 = p1[i + 1]    # i-th crit. achievement of the p1
-                j = k + 1   # index of the current candidate sol (for a pair with k-th sol), starts with the next to k-th
-                phase1 = True   # skip pts with ach. close to k-th (next phase: add points close to first better enough)
-                phaseStr = 'phase1'
-                achOK = None    # ach of the distant pt
-                nFound = 0      # number of pairs found with k-th sol
+                seq1 = self.srtKeys[i][k][1]
+                scan = self.scans[i].get(seq1)  # results of the scan unchanged since the previous call
+                if scan is None:
+                    scan = self.scanPairs(i, k)
+                    self.scans[i].update({seq1: scan})
+                    self.scanEnd[i][seq1, 2:4] = scan[2]
+                (nbr, found, end) = scan
+                self.neighDist.update({nbr[0]: nbr[1]})  # neighbor data for distribution info
+                self.distances.append(nbr[1])         # store (for plots) distances between points
                 nUsed = 0       # number of already used pairs with k-th sol
-                while j < len(achiev):
-                    # todo: check, if the below condition is indeed useful (next left pt has likely other pattern of remaining crit.)
-                    '''
-                    if j < jLast:
-                        j += 1
-                        continue    # current point already used as the right pt in a previous pair; take a next point
-                    jLast = j
-                    '''
-                    p2 = achiev[j]
-                    id2 = p2[0]
-                    ach2 = p2[i + 1]
-                    diff = ach2 - ach1
-                    pair = self.sortPair([id1, id2])
-                    key = (pair[0], pair[1], i)
-                    # if j == k + 1 and diff > self.achDiff and not self.chk(pair):  # skip used pairs and very small diffs
-                    # todo: collect info on gaps (see pipaMac/xGap, itrs>=70 resulting in sols close to the cube-corners)
-                    if j == k + 1:  # use all neighbors of the i-th criterion
-                        self.neighDist.update({key: diff})  # neighbor data for distribution info
-                        self.distances.append(diff)         # store (for plots) distances between points
-                    j += 1
-                    # check, if the current point is OK for the pair with k-th pt
-                    if phase1:  # looking for the first pt distant enough from k-th pt
-                        # isOK = diff > self.gap    # this skips neighbor closer than the gap
-                        isOK = diff > self.achDiff
-                        if isOK:    # first pair with k-th pt, use it and move to phase2
-                            phase1 = False     # start phase2, i.e., looking for pt close to the first distant pt
-                            phaseStr = 'phase2'
-                            achOK = ach2       # achivement OK for the second phase
-                            if self.verbose > 4:
-                                print(f'pair {key}, diff {diff:.2f}: move to phase2')
-                        else:
-                            if self.verbose > 4:
-                                print(f'{phaseStr}, pt {id1}, {ach1:.2f}: skipping too close pt {id2}, ach {ach2:.2f}: '
-                                      f'checking next pt.')
-                            continue    # look for the first pt distant enough from p1
-                    else:       # phase2: look for a pt close to the right pt of the first pair with k-th pt
-                        if abs(achOK - ach2) < self.achDiff:
-                            isOK = True     # current point close enough to the first distant pt
-                        else:
-                            if self.verbose > 4:
-                                print(f'{phaseStr}, skipping pt {id2}, ach {ach2:.2f}: too distant to {achOK:.2f}, '
-                                      f'checking next pt.')
-                            break   # no (more) suitable pair(s) with k-th point
-
-                    # check, if p1 and p2 are in the same 2-dim plane
-                    neighOK = True
-                    '''
-                    for d in range(self.mc.n_crit):  # check if p1 & p2 are neighbors in more than i-th crit
-                        if d == i:
-                            continue    # p1 and p2 are obviously neighbors in the i-th criterion
-                        ach3 = p1[d + 1]
-                        ach4 = p2[d + 1]
-                        if self.verbose > 4:
-                            print(f'{phaseStr}, {key}, d {d}, ach3 {ach3:.2f}, ach4 {ach4:.2f}')
-                        if abs(ach3 - ach4) < self.achDiff:     # neighbor in d-th crit.
-                            neighOK = True
-                            break  # find pair(s) with the next point
-                    '''
-                    if self.verbose > 4:
-                        print(f'{phaseStr}, {key}, diff {diff:.2f}, isOK {isOK}, neighOK {neighOK}')
-                    if not isOK or not neighOK:
-                        continue    # find pair(s) with the next point
-
-                    # found pt suitable for the cube-generation pair
-                    nFound += 1
+                for (key, pair, diff) in found:
                     if not self.chk(pair):
                         self.neighCube.update({key: diff})
                         if self.verbose > 4:
@@ -200,11 +217,10 @@ class Neigh:     # representation of the neighbors
                         nUsed += 1
                         if self.verbose > 4:
                             print(f'skipping pair {key} (used in a previous iteration).')
-                    # try next pt to make a pair with k-th sol.
                 # end of looking for pairs with k-th sol.
                 if self.verbose > 2:
-                    print(f'Neigh::mkPairs(): {nFound} pairs found for {k}-th sol, {i}-th crit, incl. {nUsed} already used.')
-                pass
+                    print(f'Neigh::mkPairs(): {len(found)} pairs found for {k}-th sol, {i}-th crit, '
+                          f'incl. {nUsed} already used.')
         pass
 
     '''
@@ -392,7 +408,7 @@ class Neigh:     # representation of the neighbors
         self.cand = {}
         self.neighCube = {}  # neighbors for each point/solution and criterion
         self.neighDist = {}     # neighbors of each point and criterion
-        self.solSort = []       # solutions sorted by increasing achievement for each criterion separately
+        # self.solSort (solutions sorted by increasing achievement for each criterion) is updated by self.addPt()
         self.distances = []     # list of distances between solutions (for each criterion)
         # self.wrkCand = []  # drop the old lists and dictionary
         # self.wrkPairs = {}
@@ -421,11 +437,19 @@ class Neigh:     # representation of the neighbors
     def selCand(self):
         # if len(self.cand) == 0:
         #     raise Exception(f'Neigh::selCand() called for empty candidate list.')
-        d =  sorted(self.cand.items(), key= itemgetter(1), reverse=True)   # default False: ascending
+        if self.prio == 'hv':   # the largest hypervolume of the box spanned by the pair first (then the largest dist)
+            d = sorted(self.cand.items(), reverse=True,
+                       key=lambda item: (box_hv([self.points[item[0][0]], self.points[item[0][1]]]), item[1]))
+        else:
+            d = sorted(self.cand.items(), key= itemgetter(1), reverse=True)   # default False: ascending
         for pair, val in d:
             is_used = self.chk(pair)
             if is_used:     # should not happen, but just in case...
                 raise Exception(f'Neigh::selCand() - pair {pair} was already used.')
+            if self.parRep.excl is not None and self.parRep.excl.skip([self.points[pair[0]], self.points[pair[1]]]):
+                self.done.update({pair: val})   # the pair is inside a region without new solutions
+                self.cand.pop(pair)
+                continue
             self.lastPair = pair
             self.done.update({self.lastPair: val})
             self.cand.pop(pair)
@@ -1,9 +1,14 @@
 import datetime
+import numpy as np
 import pandas as pd
 from operator import itemgetter
 # from numpy.ma.core import append
 
-from .cube import ParSol, Cubes, aCube
+from .cube import ParSol, Cubes, ExclRegs, aCube, aSimplex, NO_ID
+from .sol_arch import SolArch, SolList, UNIQUE, CLOSE, POOL_ID0   # array-backed archive of solutions
+from .sol_idx import SolIdx, NearIdx, CritIdx   # indices for closeness, dominance, and neighbor checks
+from .indic import Indic    # quality indicators of the representation
+from .timing import timed  # timing of the iteration phases
 # from .grid import Grid
 # from .corners import Corners
 
@@ -76,11 +81,21 @@ class ParRep:     # representation of the Pareto set
         self.wflow = wflow        # WrkFlow object
         self.mc = wflow.mc        # CtrMca object
         self.cfg = wflow.cfg      # Config object
-        self.sols = []            # Pareto-solutions (ParSol objects), excluding duplicated/close solutions
+        self.arch = SolArch(self.mc.n_crit)     # attributes of all computed solutions
+        self.sols = SolList(self.arch, UNIQUE)  # Pareto-solutions (ParSol objects), excluding duplicated/close solutions
         self.grid = None
         self.sols_wrk = []  # work-list of solutions (to be used for finding a most distant (in L^inf) sol-pair
-        self.clSols = []    # duplicated/close Pareto-solutions (ParSol objects)
+        self.solIdx = SolIdx(self.arch, self.cfg.get('tolClose', 0.01))  # index of self.sols (closeness, dominance)
+        self.nearIdx = NearIdx(self.arch)   # nearest neighbors of self.sols (used by solDistr())
+        self.mxNeigh = self.mc.opt('mxNeigh', 0)  # cubes of a new sol only with mxNeigh nearest sols per crit (0: all)
+        self.critIdx = CritIdx(self.arch) if self.mxNeigh > 0 else None   # sols sorted by achievements of each crit
+        self.clSols = SolList(self.arch, CLOSE)     # duplicated/close Pareto-solutions (ParSol objects)
+        self.indic = Indic(self)    # quality indicators (hypervolume, spacing) of self.sols
+        self.excl = ExclRegs(self) if self.mc.opt('exclReg', False) else None  # regions without new Pareto sols
+        self.n_domin = 0    # number of dominated solutions (either new, or removed from self.sols)
+        self.pool_id = POOL_ID0     # id of the next solution harvested from the solver pool (option solPool)
         self.neighSol = None  # object handling neighbor sols (made after corners, and optionally neutral sols)
+        self.simplex = None   # triangulation of the sols (option simplex, made after corners, and optionally neutral)
         self.cubes = Cubes(self)  # the object handling all cubes
         self.progr = ParProg(self)  # the object handling computation progress
         self.gap = self.mc.opt('mxGap', 10)
@@ -106,9 +121,9 @@ class ParRep:     # representation of the Pareto set
         print('Initializing Pareto-set exploration. --------------------')
 
     def get(self, s_id):    # return the solution by its id
-        for s in self.sols:
-            if s.itr_id == s_id:
-                return s
+        s = self.sols.get(s_id)
+        if s is not None:
+            return s
         raise Exception(f'ParRep::get() - solution id {s_id} not in the set of solutions.')
 
     # should not be used if neighbors are handled by the Neigh class (cfg option: mCube)
@@ -116,8 +131,11 @@ class ParRep:     # representation of the Pareto set
         #  Note: neighbor (for each solution) is the closest other solution
         is_grid = self.mc.opt('grid', False)
         is_mcube = self.mc.opt('mCube', False)
-        if is_grid or is_mcube:
-            if is_grid:
+        is_simplex = self.mc.opt('simplex', False)
+        if is_grid or is_mcube or is_simplex:
+            if is_simplex:
+                self.distances = self.simplex.distances()   # lengths of the triangulation edges
+            elif is_grid:
                 self.distances = self.grid.distances()
                 # raise Exception(f'ParRep::solDistr() - processing Grid distances not implemented.')
             elif is_mcube:
@@ -138,50 +156,16 @@ class ParRep:     # representation of the Pareto set
             self.sampleSeq += 1
             return
 
-        n_sols = len(self.sols)       # number of Pareto-sols computed so far
-        self.neigh = {}         # renew the working dict for neighbors
-        for ind1 in range(n_sols - 1):  # the last solution has no next to compare with
-            self.neigh.update({self.sols[ind1].itr_id: [None, float('inf')]})
-        for ind1 in range(n_sols - 1):  # the last solution has no next to compare with
-            s1 = self.sols[ind1]
-            id1 = s1.itr_id
-            if s1.domin < 0:
-                print(f'dominated solution s1 {id1}i skipped in solDistr().')
-                continue    # skip dominated solutions
-            neigh = self.neigh[id1]
-            s1Dist = neigh[1]     # min Linf-distance between s1 and the other (found so far) closest solutions
-            # if id1 == 12:
-            #     print('trap')
-            #     pass
-            # pass
-            for ind2 in range(ind1 + 1, n_sols):    # find the closest neighbor
-                s2 = self.sols[ind2]
-                id2 = s2.itr_id
-                # if id1 in [97, 98, 99] and id2 in [118, 119, 120]:
-                #     print(f'trap s2: {id1 = }, {id2 = }, {n_sols = }')
-                #     pass
-                if s2.domin < 0:
-                    raise Exception(f'ParRep::solDistr() - dominated solution in self.sols (id: {id2}).')
-                # print(f'ind1 {ind1}, ind2 {ind2}: s1.itr_id {s1.itr_id}, s2.itr_id {s2.itr_id}')
-                if id1 == id2:
-                    raise Exception(f'ParRep::solDistr() - duplicate itr_id: {s1.itr_id}.')
-                dist = 0.   # Linf distance between the current pair of solutions
-                for (a1, a2) in zip(s1.a_vals, s2.a_vals):  # loop over achievements of criteria
-                    edge = abs(a1 - a2)
-                    dist = max(dist, edge)      # Linf dist defined by the max edge
-                if dist < s1Dist:     # a closer (than any previously found) s1 neighbor found
-                    s1Dist = dist     # distance to the closest neighbor
-                    self.neigh.update({id1: [id2, s1Dist]})     # update neighbor of s1
-                '''
-                # The below prevents finding another (say s3) neighbor of s2, if s2 is closer to s1 than s2 to s3.
-                s2prev = self.neigh.get(id2)    # previosly found neighbor of s2
-                prevDist = s2prev[1]        # previously found distance between s2 and this neighbor
-                if dist < prevDist:
-                    self.neigh.update({id2: [id1, dist]})     # update previously found s2 neighbor
-                '''
-                # continue with the next s2
-            # continue with the next s1
-            pass
+        rows = self.sols.rows()     # rows of the solutions in the arch arrays
+        if (self.arch.domin[rows] < 0).any():
+            id2 = self.arch.itr_id[rows][self.arch.domin[rows] < 0][0]
+            raise Exception(f'ParRep::solDistr() - dominated solution in self.sols (id: {id2}).')
+        rows = rows[:-1]    # the last solution has no next to compare with
+        # renew the working dict for neighbors (maintained by self.nearIdx while adding/removing solutions)
+        ids1 = self.arch.itr_id[rows].tolist()
+        ids2 = self.arch.itr_id[self.nearIdx.neigh[rows]].tolist()
+        dists = self.nearIdx.dist[rows].tolist()
+        self.neigh = {id1: [id2, dist] for (id1, id2, dist) in zip(ids1, ids2, dists)}
         # finished all pairs of Pareto-solutions found so far
         maxDist = 0.    # max distance between closest neighbors
         minDist = float('inf')  # min distance between closest neighbors
@@ -212,7 +196,7 @@ class ParRep:     # representation of the Pareto set
             for cr in self.mc.cr:
                 cr.setAR()
         elif self.wflow.is_par_rep:   # set preferences from the selected cube
-            if self.mc.opt('mCube', False) or self.mc.opt('grid', False):
+            if self.mc.opt('mCube', False) or self.mc.opt('grid', False) or self.mc.opt('simplex', False):
                 self.mk_aCube()
                 pass
             cube = self.cubes.select()  # the cube defining A/R for new iteration
@@ -285,6 +269,24 @@ class ParRep:     # representation of the Pareto set
         # print(f'solution {it} is between solutions ({it1}, {it2}).')
         return True  # s is inside the cube(s1, s2): all its crit-vals are between the corresponding values of s1 and s2
 
+    def in_box(self, v, v1, v2):   # vectorized is_inside() for crit-values (arrays: the last axis for criteria)
+        """return mask of: solutions v inside cube (v1, v2), or solution v inside cubes (v1, v2)."""
+        eps = 1.e-4
+        if self.mc.opt('neighZN', False):       # use ZN's definition of empty cubes
+            nadir = np.array([cr.nadir for cr in self.mc.cr])
+            sc = 100. / (np.array([cr.utopia for cr in self.mc.cr]) - nadir)
+            v = (v - nadir) * sc
+            v1 = (v1 - nadir) * sc
+            v2 = (v2 - nadir) * sc
+            inside = (np.minimum(v1, v2) - eps < v) & (v < np.maximum(v1, v2) + eps)
+            flat = (np.abs(v1 - v2) < eps) & (eps < v1) & (v1 < 100 - eps)     # pretend s outside for flat crit.
+            p1 = v1 + 0.01 * self.gap
+            p2 = v2 - 0.01 * self.gap
+            inside &= ~flat | ((np.minimum(p1, p2) - eps < v) & (v < np.maximum(p1, p2) + eps))
+            return inside.all(axis=-1)
+        # use the standard definition of empty cubes, i.e., no other solution in the cube defined by s1 and s2
+        return ((np.minimum(v1, v2) - eps < v) & (v < np.maximum(v1, v2) + eps)).all(axis=-1)
+
     # todo: improve comments below
     # add solution (uses crit-values updated in mc.cr). called from CtrMca::updCrit()
     def sizeLog(self, cube, final=False):
@@ -305,6 +307,7 @@ class ParRep:     # representation of the Pareto set
         self.log_max = 0
         self.log_mxCubes = 0
 
+    @timed('addSol')
     def addSol(self, itr_id):  # add solution (uses crit-values updated in mc.cr). called from CtrMca::updCrit()
         assert self.mc.is_opt, f'ParRep::addSol() called for non-optimal solution'
         self.cur_itr = itr_id
@@ -318,7 +321,9 @@ class ParRep:     # representation of the Pareto set
             if self.cfg.get('verb') > 3:
                 print(f'crit {cr.name} ({cr.attr}): a_val={cr.a_val:.2f}, val={cr.val:.2e}, '  # a_frac={a_frac:.2e}, '
                       f'U {cr.utopia:.2e}, N {cr.nadir:.2e}')
-        new_sol = ParSol(itr_id, self.cur_cube, vals, a_vals)
+        new_sol = self.arch.add(itr_id, self.cur_cube, vals, a_vals)
+        if self.cfg.get('verb') > 0:
+            print(f'Solution[{itr_id}] a_vals: {new_sol.a_vals}')
         if self.cur_cube is not None:   # cur_cube undefined during computation of selfish solutions
             c = self.cubes.get(self.cur_cube)     # get parent cube (for its id)
             # todo: add conditional call (only for info-print)
@@ -327,12 +332,9 @@ class ParRep:     # representation of the Pareto set
 
         is_close = False
         s_close = None
-        tolClose = self.cfg.get('tolClose', 0.01)
-        for s2 in self.sols:   # check if the new sol is close to any previous unique (i.e., not-close) sol
-            if new_sol.is_close(s2, tolClose):
-                is_close = True
-                s_close = s2
-                break
+        s_close = self.solIdx.close(new_sol)   # the first previous unique (i.e., not-close) sol close to the new sol
+        if s_close is not None:
+            is_close = True
         is_pareto = True
         if is_close:
             is_pareto = False
@@ -343,6 +345,8 @@ class ParRep:     # representation of the Pareto set
                 c = self.cubes.get(self.cur_cube)  # get parent cube (for its id)
                 new_sol.neigh_inf(c, True)   # info on location within the solutions of the parent cube
                 oldInCube = self.is_inside(s_close, c.s1, c.s2)
+                if self.excl is not None:
+                    self.excl.add(c, new_sol)   # the part of the cube above the optimal AF contains no solutions
                 if oldInCube:
                     print('WARNING: old (close to new) solution is in the current cube -------------------------------')
                 else:
@@ -352,25 +356,24 @@ class ParRep:     # representation of the Pareto set
                     self.neighSol.addSol(None, True)    # close solution ignored, but next pair needs to be found
                 if self.mc.opt('grid', False):
                     self.grid.addSol(None, True)    # close solution ignored, but next pair needs to be found
+                if self.mc.opt('simplex', False):
+                    self.simplex.addSol(None, True)    # close solution ignored, but next simplex needs to be found
                     # self.mk_aCube()  # make a cube from previously available solutions
         else:   # unique solution; check dominance with all Pareto-sols found so far
-            toPrune = []    # tmp list of solutions dominated by the current sol
-            for s2 in self.sols:   # check if the new sol is close to any previous unique (i.e., not-close) sol
-                cmp_ret = new_sol.cmp(s2)
-                if cmp_ret == 0:    # is Pareto?
-                    continue    # check next solution
-                elif cmp_ret > 0:   # new_sol dominates s2
-                    if self.cfg.get('verb') > -1:
-                        print(f'\t-------------     current solution[{itr_id}] dominates solution[{s2.itr_id}].')
-                    s2.domin = -itr_id      # mark s2 as dominated by the new solution and continue checking next sol.
-                    toPrune.append(s2)
-                else:           # new_sol is dominated by s2
-                    if self.cfg.get('verb') > -1:
-                        print(f'\t-------------     current solution[{itr_id}] is dominated by solution[{s2.itr_id}].')
-                    is_pareto = False
-                    break
+            # toPrune: tmp list of solutions dominated by the current sol, s_dom: the first sol dominating it (or None)
+            toPrune, s_dom = self.solIdx.domin(new_sol)
+            for s2 in toPrune:  # new_sol dominates s2
+                if self.cfg.get('verb') > -1:
+                    print(f'\t-------------     current solution[{itr_id}] dominates solution[{s2.itr_id}].')
+                s2.domin = -itr_id      # mark s2 as dominated by the new solution
+                self.n_domin += 1
+            if s_dom is not None:   # new_sol is dominated by s_dom
+                if self.cfg.get('verb') > -1:
+                    print(f'\t-------------     current solution[{itr_id}] is dominated by solution[{s_dom.itr_id}].')
+                is_pareto = False
+                self.n_domin += 1
             if is_pareto:
-                self.sols.append(new_sol)   # add to self.sols
+                self._insert(new_sol)   # add to self.sols
 
                 # for s2 in toPrune:  # remove dominated solutions from self.sols
                 #     print(f'\tsolution[{s2.itr_id}] dominated by solution[{itr_id}] removed from self.sols.')
@@ -398,6 +401,11 @@ class ParRep:     # representation of the Pareto set
                     else:
                         pass    # do nothing before finishing Corners and neutral solution
                     pass
+                elif self.mc.opt('simplex', False):
+                    if self.wflow.cur_stage == 4:   # computing the PF (i.e., after Corners, neutral)
+                        if self.simplex is None:
+                            raise Exception('ParRep::addSol(): Simplex should have been created in WrkFlow.itr_sol()')
+                        self.simplex.addSol(new_sol)
                 else:
                     self.mk_cubes(new_sol)    # use other/old methods for defining cubes generated by this solution
             else:
@@ -410,13 +418,98 @@ class ParRep:     # representation of the Pareto set
                             pass
                     else:
                         pass    # do nothing before finishing Corners and neutral solution
+                elif self.mc.opt('simplex', False) and self.simplex is not None:
+                    self.simplex.addSol(None, True)     # ignore dominated sol, get next simplex
                 pass
             #
             for s2 in toPrune:   # remove dominated solutions from self.sols
                 print(f'\tsolution[{s2.itr_id}] dominated by solution[{itr_id}] removed from self.sols.')
-                self.sols.remove(s2)
+                self._drop(s2)
+        self.indic.log(itr_id)
+        return is_pareto
+
+    def _insert(self, s):   # add the Pareto solution s to self.sols and to all indices of the solutions
+        self.sols.append(s)
+        self.solIdx.add(s)
+        self.cubes.sol_in(s, 1)
+        self.nearIdx.add(s)
+        if self.critIdx is not None:
+            self.critIdx.add(s)
+        self.indic.add(s)
+
+    def _drop(self, s):     # remove the (dominated) solution s from self.sols and from all indices of the solutions
+        self.sols.remove(s)
+        self.solIdx.remove(s)
+        self.cubes.sol_in(s, -1)
+        self.nearIdx.remove(s)
+        if self.critIdx is not None:
+            self.critIdx.remove(s)
+        self.indic.remove(s)
+
+    # Called after a reset (nadir update): the Pareto solutions of the old ParRep (made for the previous nadir) are
+    # rescaled to the achievements of the updated U/N range and added (in the order of their computation) to this
+    # (new and empty) ParRep; closeness and dominance are checked again, as for the new solutions.
+    @timed('addSol')
+    def rescale(self, old, ids=None):   # add the Pareto sols of the old ParRep (only ids, if given), return n of sols
+        rows = old.sols.rows()
+        if ids is not None:
+            rows = rows[np.isin(old.arch.itr_id[rows], list(ids))]
+        self.pool_id = old.pool_id  # the ids of the harvested solutions are not reused
+        vals = old.arch.vals[rows]
+        a_vals = np.column_stack([cr.vals2ach(vals[:, i]) for (i, cr) in enumerate(self.mc.cr)])
+        for (itr_id, val, a_val) in zip(old.arch.itr_id[rows].tolist(), vals, a_vals):
+            self.addPt(itr_id, val, a_val)
+        print(f'{len(self.sols)} out of {len(rows)} Pareto solutions (rescaled to the updated Nadir) kept, '
+              f'{len(self.clSols)} close solutions.')
+        return len(self.sols)
+
+    def last_close(self):   # return id of the Pareto solution close to the last added solution (None, if not close)
+        s = ParSol(self.arch, self.arch.n_sols - 1)
+        if s in self.clSols and self.sols.get(s.closeTo) is not None:
+            return s.closeTo
+        return None
+
+    def addPt(self, itr_id, vals, a_vals, cube_id=None):  # add the solution defined by the crit values and achievements
+        new_sol = self.arch.add(itr_id, cube_id, vals, a_vals)
+        if self.solIdx.close(new_sol) is not None:
+            self.clSols.append(new_sol)
+            return False
+        toPrune, s_dom = self.solIdx.domin(new_sol)
+        for s2 in toPrune:  # new_sol dominates s2
+            s2.domin = -itr_id      # mark s2 as dominated by the new solution
+            self.n_domin += 1
+        is_pareto = s_dom is None
+        if is_pareto:
+            self._insert(new_sol)
+            if not (self.mc.opt('mCube', False) or self.mc.opt('grid', False) or self.mc.opt('simplex', False)):
+                self.mk_cubes(new_sol)
+        else:
+            self.n_domin += 1
+        for s2 in toPrune:   # remove dominated solutions from self.sols
+            self._drop(s2)
         return is_pareto
 
+    # Solutions found by the MIP solver during the optimization for the current cube (option solPool) get their own
+    # ids (from POOL_ID0 on); only solutions within the U/N range, neither close to nor dominated by the current
+    # Pareto solutions are added (therefore the harvested solutions do not inflate the clSols).
+    @timed('addSol')
+    def addPool(self, itr_id, vals):   # add the solutions (crit values) of the pool of itr_id, return n of added sols
+        n_add = 0
+        for val in vals:
+            a_val = np.array([float(cr.vals2ach(v)) for (cr, v) in zip(self.mc.cr, val)])
+            if not np.all(a_val >= 0.):     # worse than Nadir (or undefined) for a criterion
+                continue
+            sols = self.arch.a_vals[self.sols.rows()]
+            if np.any(np.max(np.abs(sols - a_val), axis=1) <= self.solIdx.tol) or np.any(np.all(sols >= a_val, axis=1)):
+                continue
+            if self.addPt(self.pool_id, val, a_val, self.cur_cube):
+                n_add += 1
+            self.pool_id += 1
+        if n_add:
+            self.indic.log(itr_id)
+        return n_add
+
+    @timed('cubes')
     def mk_aCube(self):  # find a pair of most distant neighbor solutions and define a cube.cand around them
         if self.neighSol is not None:
             pair = self.neighSol.getPair()      # get the pair of sols' ids
@@ -424,11 +517,19 @@ class ParRep:     # representation of the Pareto set
                 raise Exception(f'ParRep::mk_aCube() - termination of itrs for mCube option is done in WrkFlow::itr_sol().')
         elif self.grid is not None:
             pair = self.grid.getPair()      # get the pair of sols' ids
+        elif self.simplex is not None:
+            ids = self.simplex.getSimplex()     # get ids of the simplex vertices
+            if ids is None:
+                raise Exception(f'ParRep::mk_aCube() - termination of itrs for simplex option is done in WrkFlow::itr_sol().')
+            pair = None
         else:
             raise Exception(f'iParRep::mk_aCube(): internal error.')
-        s1 = self.get(pair[0])
-        s2 = self.get(pair[1])
-        n_cube = aCube(self.mc, s1, s2)
+        if pair is None:    # cube spanned by the simplex vertices
+            n_cube = aSimplex(self.mc, [self.get(s_id) for s_id in ids])
+        else:
+            s1 = self.get(pair[0])
+            s2 = self.get(pair[1])
+            n_cube = aCube(self.mc, s1, s2)
         self.cubes.add(n_cube)  # adds to the list only large-enough cubes (assumes empty for 'mCube' option)
         n_cand = len(self.cubes.cand)
         # print(f'ParRep::mk_aCube(): there are {n_cand} cubes in the candidate list.')
@@ -552,9 +653,14 @@ class ParRep:     # representation of the Pareto set
             # raise Exception(f'ParRep::mk_aCube() - there are {n_cand} candidate cubes.')
         pass
 
+    @timed('cubes')
     def mk_cubes(self, s):  # generate cubes defined by the new solution with each previous distinct-solution
         verb = self.cfg.get('verb') > 2
-        for s1 in self.sols:
+        if self.critIdx is None:
+            sols = self.sols
+        else:   # only the nearest (for each criterion) solutions
+            sols = [ParSol(self.arch, row) for row in self.critIdx.near(s, self.mxNeigh)]
+        for s1 in sols:
             if s1.domin < 0:
                 continue    # skip dominated solutions
             if s.itr_id == s1.itr_id:
@@ -565,9 +671,9 @@ class ParRep:     # representation of the Pareto set
                 print(f'New cube[{n_cube.id}] of sols [{s1.itr_id}, {s.itr_id}], size {n_cube.size:2f}.')
 
     def sol_seq(self, itr_id):  # return seq_no in self.sols[] for the itr_id
-        for (i, s) in enumerate(self.sols):
-            if s.itr_id == itr_id:
-                return i
+        s = self.sols.get(itr_id)
+        if s is not None:
+            return self.sols.index(s)
         raise Exception(f'ParRep::sol_seq(): {itr_id} not in the solution set.')
 
     def summary(self):  # summary report
@@ -600,19 +706,20 @@ class ParRep:     # representation of the Pareto set
             cols.append(cr.name)
         for cr in self.mc.cr:   # space for criteria achievements
             cols.append('a_' + cr.name)
-        rows = []   # each row with crit attributes for a solution
-        for s in self.sols:
-            new_row = {'itr_id': s.itr_id}
-            for (i, cr) in enumerate(self.mc.cr):   # cols with crit values
-                new_row.update({cr.name: s.vals[i]})
-            for (i, cr) in enumerate(self.mc.cr):   # cols with crit achievements
-                new_row.update({'a_' + cr.name: s.a_vals[i]})
-            cube_id = s.cube_id
-            if cube_id is None:     # selfish solutions are not generated from a cube
-                new_row.update({'parents': f'[none]'})
+        rows = self.sols.rows()     # rows (of the arch arrays) of the solutions
+        parents = []    # itr_ids of the solutions defining the parent cube of each solution
+        for cube_id in self.arch.cube_id[rows]:
+            if cube_id == NO_ID:    # selfish solutions are not generated from a cube
+                parents.append(f'[none]')
             else:
-                cube = self.cubes.get(cube_id)  # parent cube
-                new_row.update({'parents': f'[{cube.s1.itr_id}, {cube.s2.itr_id}]'})
-            new_row.update({'domin': s.domin})
-            rows.append(new_row)
-        self.df_sol = pd.DataFrame(rows)
+                cube = self.cubes.get(int(cube_id))  # parent cube
+                parents.append(f'[{cube.s1.itr_id}, {cube.s2.itr_id}]')
+        self.df_sol = pd.DataFrame({'itr_id': self.arch.itr_id[rows]})
+        for (i, cr) in enumerate(self.mc.cr):   # cols with crit values
+            self.df_sol[cr.name] = self.arch.vals[rows, i]
+        for (i, cr) in enumerate(self.mc.cr):   # cols with crit achievements
+            self.df_sol['a_' + cr.name] = self.arch.a_vals[rows, i]
+        self.df_sol['parents'] = parents
+        if self.mc.opt('solPool', 0) > 0:  # flag of the solutions harvested from the solver pools
+            self.df_sol['pool'] = self.arch.itr_id[rows] >= POOL_ID0
+        self.df_sol['domin'] = self.arch.domin[rows]
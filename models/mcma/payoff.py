@@ -34,14 +34,7 @@ class PayOff:   # payoff table: try to download, set A/R for computing, update N
         if self.cur_stage == 1:     # utopia
             i_cr = self.chk_utopia()   # check, if all utopias computed
             if i_cr > -1:   # utopia of i_cr-th criterion needs to be computed
-                self.cur_cr = i_cr
-                print(f'Utopia of criterion "{self.cr[i_cr].name}" shall be computed.')
-                for (i, crit) in enumerate(self.cr):
-                    crit.is_fixed = False
-                    if self.cur_cr == i:
-                        crit.is_active = True
-                    else:
-                        crit.is_active = False
+                self.set_cr(i_cr)
                 return
             else:   # all utopia computed, should not come here
                 raise Exception(f'PayOff::next_pref() all crit. already processed in stage: {self.cur_stage}.')
@@ -57,17 +50,33 @@ class PayOff:   # payoff table: try to download, set A/R for computing, update N
                 else:       # in 2nd nadir appr. (cur_stage 3)
                     raise Exception(f'PayOff::next_pref() all crit. already processed in stage: {self.cur_stage}.')
 
-            # only activity set; U/N will be used for (the set as None) A/R
-            print(f'Appr. Nadir of crit. other than {self.cr[self.cur_cr].name} (stage {self.cur_stage}).')
-            for (i, cr) in enumerate(self.cr):
-                cr.is_fixed = False
-                if self.cur_cr == i:
-                    cr.is_active = True
-                else:
-                    cr.is_active = False
+            self.set_cr(self.cur_cr)
         else:
             raise Exception(f'PayOff::next_pref() should not be called for stage: {self.cur_stage}.')
 
+    def set_cr(self, i_cr):    # set preferences for the selfish optimization of i_cr-th criterion
+        self.cur_cr = i_cr
+        if self.cur_stage == 1:
+            print(f'Utopia of criterion "{self.cr[i_cr].name}" shall be computed.')
+        else:
+            # only activity set; U/N will be used for (the set as None) A/R
+            print(f'Appr. Nadir of crit. other than {self.cr[i_cr].name} (stage {self.cur_stage}).')
+        for (i, cr) in enumerate(self.cr):
+            cr.is_fixed = False
+            if i_cr == i:
+                cr.is_active = True
+            else:
+                cr.is_active = False
+
+    def pass_crit(self):   # return indices of criteria not yet processed in the current payoff stage (pass)
+        # selfish optimizations within a pass are mutually independent: they can be solved concurrently, while the
+        # resulting utopia/nadir updates are applied by next_sol() in the order of the returned criteria
+        if self.cur_stage == 1:
+            return [i for (i, cr) in enumerate(self.cr) if cr.utopia is None]
+        elif self.cur_stage in [2, 3]:
+            return list(range(self.cur_cr, self.n_crit))
+        return []
+
     def next_sol(self):   # process results of the current iteration
         if self.cur_stage == 1:     # utopia
             for cr in self.cr:
@@ -0,0 +1,77 @@
+"""
+Solve batches of preferences concurrently by a pool of worker processes, each holding its own core model
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from .rd_inst import rd_inst  # model instance provider
+from .ctr_mca import CtrMca
+from .mc_block import McMod
+from .solver import Solver, chk_sol
+from .timing import timed  # timing of the iteration phases
+
+_wrk = None     # PoolWrk object of the worker process (set by _wrk_init())
+
+
+def _wrk_init(cfg):   # executed once in each worker process
+    global _wrk
+    sys.stdout = open(os.devnull, 'w')  # printouts of workers would be mixed with the printouts of the driver
+    _wrk = PoolWrk(cfg)
+
+
+def _wrk_solve(task):  # executed in a worker process for each task
+    return _wrk.solve(task)
+
+
+# noinspection SpellCheckingInspection
+class PayStage:     # stage of the PayOff table (the only PayOff attribute needed by McMod)
+    def __init__(self):
+        self.cur_stage = None
+
+
+# noinspection SpellCheckingInspection
+class PoolWrk:  # worker counterpart of WrkFlow: own core model, criteria, mc-block, and solver
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.cur_stage = None   # set for each task
+        self.payoff = PayStage()
+        self.mc = CtrMca(self)  # initialize criteria
+        m1 = rd_inst(cfg)    # upload the core model
+        self.mc_gen = McMod(self, m1)
+        self.solv = Solver(self, m1)
+
+    def solve(self, task):   # solve the task; return record of the solution values (None, if not optimal)
+        self.cur_stage, self.payoff.cur_stage, self.mc.deg_exp, u_n, prefs = task
+        for (cr, (utopia, nadir), pref) in zip(self.mc.cr, u_n, prefs):
+            cr.utopia = utopia
+            cr.nadir = nadir
+            cr.setPref(pref)
+        mc_part = self.mc_gen.mc_itr()
+        if mc_part is None:
+            return None
+        results = self.solv.solve(mc_part)
+        if not chk_sol(results):
+            return None
+        return self.solv.get_rec(mc_part)
+
+
+# noinspection SpellCheckingInspection
+class SolvPool:     # pool of worker processes solving batches of preferences
+    def __init__(self, wflow, n_proc):
+        self.wflow = wflow
+        self.mc = wflow.mc
+        self.n_proc = n_proc
+        self.n_tasks = 0    # number of solved tasks
+        self.exe = ProcessPoolExecutor(max_workers=n_proc, initializer=_wrk_init, initargs=(wflow.cfg,))
+        print(f'Pool of {n_proc} worker processes created.')
+
+    @timed('solve')
+    def solve(self, prefs):     # solve preferences (made by WrkFlow.get_pref()), return solutions in the prefs order
+        u_n = [(cr.utopia, cr.nadir) for cr in self.mc.cr]   # U/N at the batch start are used for all its prefs
+        tasks = [(pref.get('stage'), pref.get('pay_stage'), self.mc.deg_exp, u_n, pref.get('cr')) for pref in prefs]
+        self.n_tasks += len(tasks)
+        return list(self.exe.map(_wrk_solve, tasks))   # map() keeps the order of tasks
+
+    def close(self):
+        self.exe.shutdown()
+        print(f'Pool of {self.n_proc} worker processes closed after solving {self.n_tasks} tasks.')
@@ -0,0 +1,108 @@
+"""
+Storage of values of the core-model variables requested to be reported (rep_vars): float rows streamed to npy-chunks
+"""
+import os
+import glob
+import numpy as np
+import pandas as pd
+import pyomo.environ as pe  # more robust than using import *
+
+
+# noinspection SpellCheckingInspection
+class RepVars:
+    """values (for each solution) of rep_vars, stored in numpy chunks.
+
+    The order of columns (simple vars and items of indexed vars) is resolved at the first solution; then each solution
+    adds one float row (itr_id followed by the values) to the current chunk. Complete chunks are saved in the
+    resDir/modelVars/ dir as vals_<seq>.npy files; the csv file (with formatted values) is made only by summary().
+    """
+    def __init__(self, rep):
+        self.rep = rep      # Report
+        self.mc = rep.mc
+        self.rep_vars = rep.rep_vars    # names of the core-model variables to be reported
+        self.cols = None    # names of the columns: var_name or var_name_index (resolved at the first solution)
+        self.idx = None     # for each rep_var: list of indices (None for simple var), same order as in self.cols
+        self.var_data = None    # list of pyomo var-objects (simple vars and items of indexed vars) in self.cols order
+        self.chunk_size = self.mc.opt('varChunk', 100)  # number of rows stored in a chunk
+        self.rows = []      # rows of the current (not yet saved) chunk
+        self.n_chunks = 0   # number of saved chunks
+        self.n_rows = 0     # number of all (saved and current) rows
+        self.dir_name = f'{rep.rep_dir}modelVars/'   # dir for chunks
+        self.do_csv = self.mc.opt('varsCsv', True)  # if True, then also store values in (formatted) csv file
+        if len(self.rep_vars):
+            if not os.path.exists(self.dir_name):
+                os.makedirs(self.dir_name, mode=0o755)
+            for f_name in glob.glob(f'{self.dir_name}vals_*.npy'):   # remove chunks of a previous run
+                os.remove(f_name)
+
+    def __getstate__(self):     # the var-objects (of the core model) are not stored in checkpoints
+        state = self.__dict__.copy()
+        state.update({'var_data': None})
+        return state
+
+    def mk_cols(self, m1):    # resolve (once) the order of columns
+        m1_vars = m1.component_map(ctype=pe.Var)  # all variables of the m1 (core model)
+        if self.cols is None:
+            self.cols = []
+            self.idx = []
+            for var_name in self.rep_vars:
+                if var_name not in m1_vars:
+                    raise Exception(f'RepVars::mk_cols(): variable {var_name} is not defined in the core model.')
+                m1_var = m1_vars[var_name]
+                if m1_var.is_indexed():
+                    ind_lst = list(m1_var.keys())
+                    self.idx.append(ind_lst)
+                    for ind in ind_lst:
+                        self.cols.append(f'{var_name}_{ind}')
+                else:
+                    self.idx.append(None)
+                    self.cols.append(var_name)
+            with open(f'{self.dir_name}cols.txt', 'w') as f:
+                f.write('\n'.join(['itr'] + self.cols) + '\n')
+        self.var_data = []   # (re)made also after resuming from a checkpoint
+        for (var_name, ind_lst) in zip(self.rep_vars, self.idx):
+            m1_var = m1_vars[var_name]
+            if ind_lst is None:
+                self.var_data.append(m1_var)
+            else:
+                self.var_data.extend([m1_var[ind] for ind in ind_lst])
+
+    def add(self, m1, itr_id):   # add row of values of the current solution
+        if self.var_data is None:
+            self.mk_cols(m1)
+        row = np.array([itr_id] + [v.value for v in self.var_data], dtype=float)   # None (undefined) stored as NaN
+        self.rows.append(row)
+        self.n_rows += 1
+        if len(self.rows) >= self.chunk_size:
+            self.save()
+
+    def save(self):     # save the current chunk
+        if len(self.rows) == 0:
+            return
+        np.save(f'{self.dir_name}vals_{self.n_chunks:05d}.npy', np.vstack(self.rows))
+        self.n_chunks += 1
+        self.rows = []
+
+    def vals(self):     # return 2D-array with all stored rows
+        self.save()
+        chunks = [np.load(f'{self.dir_name}vals_{i:05d}.npy') for i in range(self.n_chunks)]
+        if len(chunks) == 0:
+            return np.empty((0, 1 + len(self.cols or [])))
+        return np.vstack(chunks)
+
+    def summary(self, f_name):   # return df with values of rep_vars (None if not made); optionally store it as csv
+        if len(self.rep_vars) == 0 or self.n_rows == 0:
+            df = pd.DataFrame()
+            df.to_csv(f_name, index=True)
+            return df
+        print(f'Values of core-model variables requested to be reported ({self.n_rows} solutions) are stored in '
+              f'{self.n_chunks + (len(self.rows) > 0)} npy-files in the "{self.dir_name}" dir.')
+        if not self.do_csv:
+            return None
+        vals = self.vals()
+        df = pd.DataFrame(vals[:, 1:], columns=self.cols)
+        df.insert(0, 'itr', vals[:, 0].astype(np.int64))
+        df.to_csv(f_name, index=True, float_format='%.2e')
+        print(f'Values of core-model variables requested to be reported are stored in the DataFrame '
+              f'"{f_name}" file.')
+        return df
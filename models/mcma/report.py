@@ -3,11 +3,60 @@ Reporting results of the MCMA iterations. Handling core-models is generic, i.e.,
 for the report.
 """
 
-import warnings
+import numpy as np
 import pandas as pd
 import pyomo.environ as pe  # more robust than using import *
 from .plots import Plots
 from .cluster import Cluster  # cluster object
+from .timing import timed  # timing of the iteration phases
+from .rep_vars import RepVars   # storage of values of rep_vars
+
+
+# noinspection SpellCheckingInspection
+class RowBuf:   # append-only columnar buffer of rows: numpy array for each column, growing geometrically
+    def __init__(self, cols, int_cols=(), obj_cols=(), size=256):
+        self.cols = cols    # names of columns (in the order used for the df)
+        self.n_rows = 0     # number of stored rows
+        self.size = size    # number of allocated rows
+        self.data = {}      # {col_name: array}
+        for col in cols:
+            if col in int_cols:
+                self.data.update({col: np.zeros(size, dtype=np.int64)})
+            elif col in obj_cols:
+                self.data.update({col: np.full(size, None, dtype=object)})
+            else:   # float column; undefined values stored as NaN
+                self.data.update({col: np.full(size, np.nan)})
+
+    def __len__(self):
+        return self.n_rows
+
+    def append(self, row):  # row: dict {col_name: val}; values of not included cols (or None) stored as undefined
+        if self.n_rows == self.size:
+            self.grow()
+        for (col, arr) in self.data.items():
+            val = row.get(col)
+            if val is not None:
+                arr[self.n_rows] = val
+        self.n_rows += 1
+
+    def set(self, col, val):    # set the value of col in the last row
+        assert self.n_rows > 0, f'RowBuf::set(): no rows stored.'
+        self.data.get(col)[self.n_rows - 1] = val
+
+    def grow(self):     # double the allocated size
+        for (col, arr) in self.data.items():
+            if arr.dtype == object:
+                new = np.full(2 * self.size, None, dtype=object)
+            elif arr.dtype == np.float64:
+                new = np.full(2 * self.size, np.nan)
+            else:
+                new = np.zeros(2 * self.size, dtype=arr.dtype)
+            new[:self.size] = arr
+            self.data.update({col: new})
+        self.size *= 2
+
+    def df(self):   # return df composed of the stored rows
+        return pd.DataFrame({col: self.data.get(col)[:self.n_rows] for col in self.cols}, columns=self.cols)
 
 
 # noinspection SpellCheckingInspection
@@ -28,10 +77,13 @@ class Report:
             self.var_names.append(crit.var_name)
             for idx in self.id_attr:
                 self.cols.append(crit.name + idx)
-        self.itr_df = pd.DataFrame(columns=self.cols)   # df containing crit.-attributes values for each iteration.
+        self.cols += ['hv', 'spacing']    # quality indicators of the Pareto-front representation (set by Indic)
+        # buffer of crit.-attributes values for each iteration (markers stored as strings, other attributes as floats)
+        self.itr_buf = RowBuf(self.cols, ['itr_id'], [col for col in self.cols if col.endswith('_Y')])
+        self.itr_df = None  # df made from self.itr_buf by self.summary()
         self.rep_vars = self.mc.opt('rep_vars', [])    # names of the core-model variables to be included in the report
-        self.sol_vars = []  # rows with values of vars in self.sol_vars, each row for one solution/iteration
-        self.df_vars = None     # df with values (for each iter) of the vars defined in self.sol_vars
+        self.sol_vars = RepVars(self)   # values of rep_vars, each row for one solution/iteration
+        self.df_vars = None     # df with values (for each iter) of the vars defined in self.rep_vars
         self.f_iters = f'{self.rep_dir}iters.csv'  # info on iterations
         self.f_vars = f'{self.rep_dir}modelVars.csv'  # values of requested variables
         self.f_pareto = f'{self.rep_dir}parFront.csv'  # values of requested variables
@@ -44,7 +96,13 @@ class Report:
         print(f'\nReport ctor; results/plots dir: "{self.rep_dir}".     -------------')
         print(f'Core-model variables to be reported: {self.rep_vars}')
 
+    def __getstate__(self):     # the core model and plots are not stored in checkpoints
+        state = self.__dict__.copy()
+        state.update({'m1': None, 'plots': None})
+        return state
+
     # driver of processing of each solution
+    @timed('getSol')
     def itr(self, m):   # m: current mc_block (invariant core-model linked in the ctor)
         """Process values of criteria and other vars in the current solution."""
         # formatting doc: https://docs.python.org/3/library/string.html#formatstrings
@@ -88,7 +146,7 @@ class Report:
 
         return in_range
 
-    def itr_inf(self, m):    # add to self.itr_df one row with values of all attributes for each criterion
+    def itr_inf(self, m):    # add to self.itr_buf one row with values of all attributes for each criterion
         af = pe.value(m.af)
         af = round(af, 1)
         if self.wflow.payoff.cur_stage > 1:     # after utopia computed
@@ -135,43 +193,14 @@ class Report:
                 marker = 'n'
             new_row.update({self.cols[cur_col]: marker})
             cur_col += 1
-        df2 = pd.DataFrame(new_row, index=list(range(1)))
-        with warnings.catch_warnings():  # suppress the pd.concat() warning
-            warnings.filterwarnings("ignore", category=FutureWarning)
-            self.itr_df = pd.concat([self.itr_df, df2], axis=0, ignore_index=True)
+        self.itr_buf.append(new_row)
 
     # extract and store values of the variables to be included in the report
     def req_vals(self):
-        vals = []   # tmp list of lists, each for one var: [var_name, is_indexed, val(s)]
-        m1_vars = self.m1.component_map(ctype=pe.Var)  # all variables of the m1 (core model)
-        for var_name in self.rep_vars:     # loop over m1.vars of all requested var-names
-            m1_var = m1_vars[var_name]
-            if m1_var is None:
-                raise Exception(f'Variable {var_name} is not defined in the core model.')
-            if m1_var.is_indexed():
-                val_dict = m1_var.extract_values()  # values returned in dict (indexes as keys)
-                vals.append([var_name, True, val_dict])
-                # print(f'Values of indexed variable {var_name} = {val_dict}')
-            else:
-                val = m1_var.value
-                vals.append([var_name, False, val])
-                # print(f'Value of the report variable {var_name} = {val}')
-
-        # parse the extracted values into entries of a row to be included by the self.summary() in the df_vars
-        new_row = {'itr': self.itr_id}
-        for item in vals:
-            if item[1] is False:    # simple (not indexed) var
-                new_row.update({item[0]: f'{item[2]:.2e}'})
-            else:       # indexed var
-                d_item = item[2]    # dict with values of indexed var
-                for (ind, val) in d_item.items():
-                    idx = f'{item[0]}_{ind}'
-                    # Unexpected type(s):(dict[str, str])Possible type(s):(SupportsKeysAndGetItem[str, int])(Iterable[tuple[str, int]])
-                    # noinspection PyTypeChecker
-                    new_row.update({idx: f'{val:.2e}'})     # supressed the above warning (the string-key is unique)
-        self.sol_vars.append(new_row)   # append to the list of rows
+        self.sol_vars.add(self.m1, self.itr_id)
 
     # generate and store dfs with info on criteria and the variables requested for report/plots
+    @timed('report')
     def summary(self):
         if self.wflow.par_rep is None:  # Pareto-front summary
             print('No report information collected.')
@@ -179,12 +208,10 @@ class Report:
 
         self.wflow.par_rep.summary()    # prepare df_sol (solutions: itr, crit_val, cafs, info)
         # print(f'\nResults of {self.cur_itr} iters added to results of {self.prev_itr} previously made.')
+        self.itr_df = self.itr_buf.df()
         self.itr_df.to_csv(self.f_iters, index=True)
         print(f'\nCriteria attributes at each iteration are stored in the DataFrame "{self.f_iters}" file.')
-        self.df_vars = pd.DataFrame(self.sol_vars)
-        self.df_vars.to_csv(self.f_vars, index=True)
-        print(f'Values of core-model variables requested to be reported are stored in the DataFrame '
-              f'"{self.f_vars}" file.')
+        self.df_vars = self.sol_vars.summary(self.f_vars)
 
         if self.wflow.par_rep is None:  # return if Pareto-front is not computed
             return
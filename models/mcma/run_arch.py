@@ -0,0 +1,123 @@
+"""
+Archive of the solutions shared by the analyses of the same core model and criteria (option runArch)
+"""
+import os
+import hashlib
+import pickle
+import numpy as np
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+class RunArch:
+    """solutions (records of the solution values, with the preferences used for computing them) of all runs.
+
+    The archive file (in the runArch dir) is named by a hash of the core-model file and of the criteria definition;
+    therefore, it is shared by all analyses (e.g., with different options) of the same core model and criteria.
+    The preferences are answered (without solving) by the archived solution computed for the same preferences and U/N
+    values; the preferences made from a cube (in computing the PF) are answered by the archived solution located in
+    the cube, if it is not close to a solution already included in the representation.
+    """
+    def __init__(self, wflow, sol_vars):
+        self.wflow = wflow  # WrkFlow object
+        self.mc = wflow.mc  # CtrMca object
+        self.sol_vars = sol_vars    # names of the core-model vars needed for processing a solution
+        self.tol = wflow.cfg.get('tolClose', 0.01)   # max L-inf distance (in achievements) of close solutions
+        crit_def = [[cr.name, cr.attr, cr.var_name] for cr in self.mc.cr]
+        h = hashlib.sha1()
+        with open(f"{wflow.cfg.get('model_id')}.dll", 'rb') as f:
+            h.update(f.read())
+        h.update(repr(crit_def).encode())
+        arch_dir = self.mc.opt('runArch', './')
+        if not os.path.exists(arch_dir):
+            os.makedirs(arch_dir, mode=0o755)
+        self.f_arch = f'{arch_dir}{h.hexdigest()[:16]}.pkl'    # archive file
+        self.recs = []      # archived records: {'pref': pref_key(), 'rec': record of solution values}
+        self.keys = {}      # key: pref_key(), val: index of the corresponding record
+        self.vals = np.zeros((0, self.mc.n_crit))  # crit values of the records
+        self.used = np.zeros(0, dtype=bool)   # True for records used for cubes (and records not having all sol_vars)
+        self.n_old = 0      # number of records loaded from the archive file
+        self.n_pref = 0     # number of preferences answered by the records of the same preferences
+        self.n_cube = 0     # number of cubes answered by the records located in the cube
+        if os.path.exists(self.f_arch):
+            with open(self.f_arch, 'rb') as f:
+                for item in pickle.load(f).get('recs'):
+                    self.append(item)
+            self.n_old = len(self.recs)
+        print(f'{self.n_old} solutions of previous runs loaded from the archive "{self.f_arch}".')
+
+    def append(self, item):     # add the record to the archive
+        rec = item.get('rec')
+        self.keys.update({item.get('pref'): len(self.recs)})
+        self.recs.append(item)
+        self.vals = np.vstack([self.vals, [rec.get(cr.var_name) for cr in self.mc.cr]])
+        self.used = np.append(self.used, any(var_name not in rec for var_name in self.sol_vars))
+
+    def pref_key(self, pref):   # key of the preferences (made by WrkFlow.get_pref()), including the U/N values
+        u_n = [(cr.utopia, cr.nadir) for cr in self.mc.cr]
+        return repr((pref.get('stage'), pref.get('pay_stage'), self.mc.deg_exp, self.rnd(u_n),
+                     self.rnd(pref.get('cr'))))
+
+    def rnd(self, items):   # items with floats rounded (to 9 significant digits)
+        if isinstance(items, (list, tuple)):
+            return tuple(self.rnd(item) for item in items)
+        if isinstance(items, float):
+            return f'{items:.9g}'
+        return items
+
+    @timed('runArch')
+    def add(self, pref, rec):   # store the record of the solution computed for the preferences
+        key = self.pref_key(pref)
+        if rec is None or key in self.keys:
+            return
+        self.append({'pref': key, 'rec': rec})
+
+    @timed('runArch')
+    def find(self, pref):   # return the archived record answering the preferences (None, if not available)
+        ind = self.keys.get(self.pref_key(pref))
+        if ind is not None and not any(var_name not in self.recs[ind].get('rec') for var_name in self.sol_vars):
+            self.n_pref += 1
+            print(f'Solution for the preferences taken from the archive (record {ind}).')
+            return self.recs[ind].get('rec')
+        if pref.get('stage') != 4 or pref.get('cube') is None or not len(self.recs):
+            return None
+        ind = self.in_cube(self.wflow.par_rep.cubes.get(pref.get('cube')))
+        if ind is None:
+            return None
+        self.used[ind] = True
+        self.n_cube += 1
+        print(f'Solution in cube[{pref.get("cube")}] taken from the archive (record {ind}).')
+        return self.recs[ind].get('rec')
+
+    def in_cube(self, cube):    # return index of the record located (most centrally) in the cube, None if none
+        par_rep = self.wflow.par_rep
+        n_crit = self.mc.n_crit
+        lo = np.array([min(cube.a_ends(i)) for i in range(n_crit)])
+        hi = np.array([max(cube.a_ends(i)) for i in range(n_crit)])
+        a_vals = np.column_stack([cr.vals2ach(self.vals[:, i]) for (i, cr) in enumerate(self.mc.cr)])
+        inside = np.all((a_vals >= lo - self.tol) & (a_vals <= hi + self.tol) & (a_vals >= 0.), axis=1)
+        rows = np.flatnonzero(inside & ~self.used)
+        if len(rows) == 0:
+            return None
+        sols = par_rep.arch.a_vals[par_rep.sols.rows()]  # skip records close to the solutions of the representation
+        dist = np.abs(a_vals[rows][:, None, :] - sols[None, :, :]).max(axis=2).min(axis=1)
+        rows = rows[dist > self.tol]
+        if len(rows) == 0:
+            return None
+        dims = hi - lo >= cube.min_edge     # not degenerated dimensions of the cube
+        if not dims.any():
+            return int(rows[0])
+        pos = (a_vals[rows][:, dims] - lo[dims]) / (hi[dims] - lo[dims])   # relative position in the cube
+        return int(rows[np.argmax(np.minimum(pos, 1. - pos).min(axis=1))])
+
+    @timed('runArch')
+    def save(self):     # store the archive (also the records of the previous runs)
+        f_tmp = f'{self.f_arch}.tmp'
+        with open(f_tmp, 'wb') as f:
+            pickle.dump({'crit': [cr.name for cr in self.mc.cr], 'recs': self.recs}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f_tmp, self.f_arch)  # atomic: the previous archive is kept, if the writing is interrupted
+
+    def summary(self):
+        print(f'Archive "{self.f_arch}": {self.n_old} solutions of previous runs, {len(self.recs) - self.n_old} '
+              f'new solutions; {self.n_pref} preferences and {self.n_cube} cubes answered without solving.')
@@ -0,0 +1,187 @@
+"""
+Triangulation of the Pareto front: the largest simplices define the cubes for finding new solutions (option simplex)
+"""
+from itertools import combinations
+import numpy as np
+from scipy.spatial import Delaunay, QhullError
+from .cube import CandQ, box_hv
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+class Simplex:     # triangulation of the Pareto solutions
+    """Delaunay triangulation of the Pareto solutions in the (n_crit - 1)-dimensional achievement space.
+
+    The achievement vectors are projected onto the hyperplane orthogonal to the (1, ..., 1) direction; the projection
+    is one-to-one for mutually non-dominated solutions, therefore the triangulation of the projected points connects
+    only the geometric neighbors on the front. The triangulation is updated incrementally (by Qhull) for each new
+    solution; it is rebuilt only after removal of dominated solutions, or if Qhull cannot add the point.
+    The simplex size is the L-inf diameter (in achievements) of its vertices, i.e., the size of the cube spanned by
+    the simplex; the largest not yet used simplex, larger than the mxGap, is selected for the next cube.
+    Like the cubes of the default mode, the simplices with another Pareto solution inside their cube are not used:
+    they are not queued, and the queued ones are dropped (when selected) if a later solution is inside their cube.
+    Also not used are the simplices of the same worst achievements as a simplex already used, if the solution found
+    for that simplex is not worse than these achievements: its AF has the same R, thus the same solution is found.
+    """
+    def __init__(self, parRep):     # initialize by the corner, and optionally neutral, solutions
+        # references for convenience access
+        self.parRep = parRep    # PF representation object
+        self.mc = parRep.mc     # CtrMca object
+        self.arch = parRep.arch     # SolArch object
+        self.sols = parRep.sols     # Pareto-solutions (ParSol objects), excluding duplicated/close solutions
+        self.n_dim = self.mc.n_crit - 1     # dimension of the triangulated space
+        # orthonormal basis of the hyperplane orthogonal to (1, ..., 1)
+        (q, _) = np.linalg.qr(np.vstack([np.ones(self.mc.n_crit), np.eye(self.mc.n_crit)[:-1]]).T)
+        self.basis = q[:, 1:]
+        self.rows = []      # arch rows of the triangulated solutions (in the order of the triangulation points)
+        self.tri = None     # incremental Delaunay object (None: to be rebuilt)
+        self.simpl = np.zeros((0, self.n_dim + 1), dtype=np.int64)    # simplices (rows of triangulation points)
+        self.cur = set()    # current simplices: sorted tuples of sol-ids (itr_id) of the vertices
+        self.cand = CandQ()     # current not used simplices larger than the gap: (key, size)
+        self.done = {}      # already used simplices: key - sorted sol-ids, val - size
+        self.n_full = 0     # number of the simplices not used because of a solution inside their cube
+        self.lo = {}    # key: id of the solution found for a simplex, val: the worst achievements of that simplex
+        self.tol = parRep.cfg.get('tolClose', 0.01)     # max difference (in achievements) of the same worst values
+        self.lastSimpl = None   # ids of the vertices of the lastly selected simplex (None: no more simplices)
+        self.lastLo = None      # the worst achievements of the vertices of the lastly selected simplex
+        self.gap = self.mc.opt('mxGap', 10)  # the max gap between neighbors
+        self.prio = self.mc.opt('cubePrio', 'size')    # priority of the candidates: size, or hv (hypervolume)
+        self.verbose = 2    # print verbosity level
+        #
+        self.addSol()       # initialize the triangulation by selfish (and optionally neutral) solutions
+        pass
+
+    def __getstate__(self):     # the Qhull object is not stored in checkpoints (it is rebuilt, when needed)
+        state = self.__dict__.copy()
+        state.update({'tri': None})
+        return state
+
+    # Entry point (same as for Neigh): add a new solution and select the next simplex to be used for a new cube.
+    # Called from the ctor to store the corner (and optionally neutral) solutions, as well as for each subsequently
+    # found solution; also called for ignored solutions (close to, or dominated by, another solution).
+    # The self.getSimplex() returns either ids of the simplex vertices to be used for defining a next cube or None,
+    # if there are no more simplices to be used.
+    @timed('neigh')
+    def addSol(self, s=None, was_close=False):  # add a Pareto solution
+        if was_close:    # the last solution was close (not included in the PF); select from the current simplices
+            if self.verbose > 2:
+                print(f'Simplex::addSol(): last solution was close to or dominated by, another solution.')
+        elif s is None:   # initial call, use the corner, optionally also neutral, solutions
+            print(f'Simplex::addSol(): the ctor initialized with corner (and optionally, neutral) solutions.')
+            self.rows = [int(row) for row in self.sols.rows()]
+            self.triang()
+        else:
+            # the solutions dominated by s are removed from ParRep.sols after this call, but are already marked
+            stale = self.arch.domin[self.rows] < 0
+            self.rows.append(s.row)
+            if self.lastSimpl is not None:
+                self.lo.update({s.itr_id: self.lastLo})
+            if stale.any():     # Qhull cannot remove points: rebuild the triangulation
+                self.rows = [row for (row, is_stale) in zip(self.rows, stale.tolist() + [False]) if not is_stale]
+                self.tri = None
+            self.triang()
+        print(f'Simplex::addSol(): there are {len(self.rows)} solutions, {len(self.cur)} simplices, '
+              f'{len(self.done)} simplices done.')
+        self.selCand()
+
+    # return ids of the vertices of the simplex selected for making a next cube (None, if no more simplices)
+    @timed('neigh')
+    def getSimplex(self):
+        return self.lastSimpl
+
+    def triang(self):   # update the triangulation of self.rows, and the candidate simplices
+        pts = self.arch.a_vals[self.rows] @ self.basis     # points projected on the (n_crit - 1)-dim hyperplane
+        n_pts = len(pts)
+        if self.n_dim == 1:     # the triangulation of a line: pairs of consecutive points
+            order = np.argsort(pts[:, 0], kind='stable')
+            self.simpl = np.column_stack([order[:-1], order[1:]])
+        elif n_pts <= self.n_dim:
+            self.simpl = np.zeros((0, self.n_dim + 1), dtype=np.int64)
+        else:
+            if self.tri is not None:
+                try:
+                    self.tri.add_points(pts[len(self.tri.points):])
+                except QhullError:
+                    self.tri.close()
+                    self.tri = None
+            if self.tri is None:
+                try:
+                    self.tri = Delaunay(pts, incremental=True)
+                except QhullError:  # too few, or cospherical points: triangulate without the incremental mode
+                    self.tri = None
+            if self.tri is not None:
+                self.simpl = self.tri.simplices
+            else:
+                try:
+                    self.simpl = Delaunay(pts).simplices
+                except QhullError:
+                    print(f'WARNING: Simplex::triang(): {n_pts} solutions cannot be triangulated.')
+                    self.simpl = np.zeros((0, self.n_dim + 1), dtype=np.int64)
+            self.simpl = self.simpl[(self.simpl < n_pts).all(axis=1)]   # skip simplices with a point at infinity
+        # update the candidates by the new simplices; the candidates removed from the triangulation are dropped
+        rows = np.array(self.rows, dtype=np.int64)[self.simpl]
+        ids = np.sort(self.arch.itr_id[rows], axis=1)
+        a_vals = self.arch.a_vals[rows]
+        sizes = (a_vals.max(axis=1) - a_vals.min(axis=1)).max(axis=1)  # L-inf diameter of each simplex
+        new = {}
+        for (seq, (key, size)) in enumerate(zip(map(tuple, ids.tolist()), sizes.tolist())):
+            new.update({key: (size, seq)})
+        for key in self.cur.difference(new):
+            if key in self.cand:
+                self.cand.remove(key)
+        seqs = [seq for (key, (size, seq)) in new.items()
+                if key not in self.cur and key not in self.done and size >= self.gap]
+        full = self.is_full(rows[seqs])     # the cube spanned by the simplex is not empty
+        self.n_full += int(full.sum())
+        for seq in np.array(seqs, dtype=np.int64)[~full].tolist():
+            key = tuple(ids[seq].tolist())
+            self.cand.append((key, new[key][0]), box_hv(a_vals[seq]) if self.prio == 'hv' else None)
+        self.cur = set(new)
+
+    def is_full(self, rows):    # return mask of the simplices (arch rows of vertices) having a solution in their cube
+        if len(rows) == 0:
+            return np.zeros(0, dtype=bool)
+        vals = self.arch.vals[rows]     # crit values of the vertices
+        sol_rows = np.array(self.rows, dtype=np.int64)
+        inside = self.parRep.in_box(self.arch.vals[sol_rows][None, :, :], vals.min(axis=1)[:, None, :],
+                                    vals.max(axis=1)[:, None, :])
+        inside &= (sol_rows[None, :, None] != rows[:, None, :]).all(axis=2)    # skip the simplex vertices
+        full = inside.any(axis=1)
+        # the solutions found for the simplices of the same worst achievements (i.e., the same R of the AF), and not
+        # worse than these achievements, would be found again
+        lo = self.arch.a_vals[rows].min(axis=1)
+        found = [k for (k, s_id) in enumerate(self.arch.itr_id[sol_rows].tolist()) if s_id in self.lo]
+        if len(found):
+            f_lo = np.array([self.lo[s_id] for s_id in self.arch.itr_id[sol_rows[found]].tolist()])
+            f_a = self.arch.a_vals[sol_rows[found]]
+            same = np.abs(f_lo[None, :, :] - lo[:, None, :]).max(axis=2) < self.tol
+            same &= (f_a[None, :, :] > lo[:, None, :] - 1.e-4).all(axis=2)
+            full |= same.any(axis=1)
+        return full
+
+    # select (from the current candidates) the largest simplex with no solution inside its cube
+    def selCand(self):
+        while len(self.cand):
+            (key, size) = self.cand.pop()
+            self.done.update({key: size})
+            rows = np.array([self.parRep.get(s_id).row for s_id in key], dtype=np.int64)
+            if self.is_full(rows[None, :])[0]:
+                self.n_full += 1    # a solution (found after queueing the simplex) is inside its cube
+                continue
+            self.lastSimpl = key
+            self.lastLo = self.arch.a_vals[rows].min(axis=0)
+            print(f'Solutions {key} size {size:.1f} selected for the next cube. {len(self.cand)} candidates left.')
+            return True
+        self.lastSimpl = None
+        print(f'\nSimplex::selCand(): all suitable simplices were provided. Terminate the iterations. -----------')
+        print(f'Simplex::selCand(): {self.n_full} simplices with a solution inside their cube not used.')
+        return False
+
+    def distances(self):    # return L-inf lengths of the edges of the current triangulation
+        rows = np.array(self.rows, dtype=np.int64)[self.simpl]
+        if len(rows) == 0:
+            return []
+        edges = np.vstack([rows[:, [i, j]] for (i, j) in combinations(range(self.n_dim + 1), 2)])
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        a_vals = self.arch.a_vals
+        return np.abs(a_vals[edges[:, 0]] - a_vals[edges[:, 1]]).max(axis=1).tolist()
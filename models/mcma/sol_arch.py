@@ -0,0 +1,102 @@
+"""
+Archive of the computed Pareto solutions: attributes of all solutions stored in contiguous numpy arrays
+"""
+import numpy as np
+from .cube import ParSol, NO_ID
+
+UNIQUE = 1  # state of solutions included in ParRep.sols
+CLOSE = 2   # state of solutions included in ParRep.clSols (state 0: dominated solutions)
+POOL_ID0 = 1000000  # ids of the solutions harvested from the solver pools (option solPool) follow the itr_ids
+
+
+# noinspection SpellCheckingInspection
+class SolArch:
+    """attributes of all solutions (rows in the order of computation), ParSol objects are views of the rows.
+
+    The lists of solutions (ParRep.sols, ParRep.clSols) are SolList objects selecting the rows by their state;
+    therefore vectorized operations on the solutions can directly use the arrays (rows returned by SolList.rows()).
+    """
+    # attributes stored in arrays: {name: (dtype, value of not used rows)}
+    ATTRS = {'itr_id': (np.int64, 0), 'cube_id': (np.int64, NO_ID), 'domin': (np.int64, 0),
+             'closeTo': (np.int64, NO_ID), 'distMx': (float, np.nan), 'state': (np.int8, 0),
+             'vals': (float, 0.), 'a_vals': (float, 0.)}
+
+    def __init__(self, n_crit, size=256):
+        self.n_crit = n_crit
+        self.n_sols = 0     # number of stored solutions (used rows)
+        self.id_rows = {}   # key: itr_id, val: rows of the solution (an itr may add its solution twice)
+        for (name, (dtype, fill)) in self.ATTRS.items():
+            shape = (size, n_crit) if name in ['vals', 'a_vals'] else size
+            setattr(self, name, np.full(shape, fill, dtype=dtype))
+
+    def add(self, itr_id, cube_id, vals, a_vals):   # store the new solution, return its ParSol (view)
+        row = self.n_sols
+        if row == len(self.itr_id):     # double the size of the arrays
+            for (name, (dtype, fill)) in self.ATTRS.items():
+                arr = getattr(self, name)
+                setattr(self, name, np.concatenate([arr, np.full(arr.shape, fill, dtype=dtype)]))
+        self.itr_id[row] = itr_id
+        self.cube_id[row] = NO_ID if cube_id is None else cube_id
+        self.vals[row] = vals
+        self.a_vals[row] = a_vals
+        self.n_sols += 1
+        self.id_rows.setdefault(itr_id, []).append(row)
+        return ParSol(self, row)
+
+    def rows(self, itr_id):     # return rows of the solution itr_id
+        return self.id_rows.get(itr_id, [])
+
+
+# noinspection SpellCheckingInspection
+class SolList:
+    """sequence (replacing the list of ParSol objects) of the archive solutions of the given state, ordered by rows."""
+    def __init__(self, arch, state):
+        self.arch = arch    # SolArch object
+        self.state = state  # state of the solutions in the list
+        self.n_sols = 0     # number of solutions in the list
+        self.rows_lst = None    # array of rows of the solutions (None: to be made)
+
+    def rows(self):     # return array of rows of the solutions
+        if self.rows_lst is None:
+            self.rows_lst = np.flatnonzero(self.arch.state[:self.arch.n_sols] == self.state)
+        return self.rows_lst
+
+    def __len__(self):
+        return self.n_sols
+
+    def __iter__(self):
+        arch = self.arch
+        for row in self.rows():
+            yield ParSol(arch, int(row))
+
+    def __getitem__(self, ind):
+        if isinstance(ind, slice):
+            return [ParSol(self.arch, int(row)) for row in self.rows()[ind]]
+        return ParSol(self.arch, int(self.rows()[ind]))
+
+    def __contains__(self, s):
+        return s.arch is self.arch and self.arch.state[s.row] == self.state
+
+    def append(self, s):    # add the solution (the last stored in the archive) to the list
+        assert s.arch is self.arch and self.arch.state[s.row] == 0, f'SolList::append(): sol[{s.itr_id}] in a list.'
+        self.arch.state[s.row] = self.state
+        self.n_sols += 1
+        self.rows_lst = None
+
+    def remove(self, s):
+        if s not in self:
+            raise ValueError(f'SolList::remove(): sol[{s.itr_id}] not in the list.')
+        self.arch.state[s.row] = 0
+        self.n_sols -= 1
+        self.rows_lst = None
+
+    def get(self, itr_id):  # return the solution of itr_id, None if not in the list
+        for row in self.arch.rows(itr_id):
+            if self.arch.state[row] == self.state:
+                return ParSol(self.arch, row)
+        return None
+
+    def index(self, s):     # return the position of the solution in the list
+        if s not in self:
+            raise ValueError(f'SolList::index(): sol[{s.itr_id}] not in the list.')
+        return int(np.searchsorted(self.rows(), s.row))
@@ -0,0 +1,139 @@
+"""
+Indices of the (unique) Pareto solutions in the achievement space: closeness, dominance, and neighbor queries
+"""
+import math
+import bisect
+from itertools import product
+import numpy as np
+from .cube import ParSol
+from .sol_arch import UNIQUE
+
+
+# noinspection SpellCheckingInspection
+class SolIdx:
+    """index of the solutions stored in ParRep.sols, provides the same results as linear scans of ParRep.sols.
+
+    Closeness (L-inf distance not larger than tol) is checked only for solutions in the neighbor cells of a grid-hash
+    with cells slightly larger than tol; dominance is checked by a vectorized comparison with the SolArch achievements.
+    In both cases the solutions are processed in the order of the SolArch rows, i.e., in the order of ParRep.sols.
+    """
+    def __init__(self, arch, tol):
+        self.arch = arch    # SolArch object
+        self.tol = tol      # max L-inf distance between close solutions
+        self.cell = max(tol, 1.e-6) * (1. + 1.e-9)     # cell size > tol: close solutions are in neighbor cells
+        self.n_dims = min(arch.n_crit, 4)   # number of criteria used for the grid-hash (limits number of neighbor cells)
+        self.offsets = list(product((-1, 0, 1), repeat=self.n_dims))   # offsets of the neighbor cells
+        self.cells = {}     # grid-hash {cell: [row, ...]}
+
+    def key(self, a_vals):  # return the grid-hash cell of the achievements
+        return tuple(math.floor(a_vals[i] / self.cell) for i in range(self.n_dims))
+
+    def add(self, s):   # add the solution
+        self.cells.setdefault(self.key(s.a_vals), []).append(s.row)
+
+    def remove(self, s):    # remove the solution
+        self.cells.get(self.key(s.a_vals)).remove(s.row)
+
+    def close(self, new_sol):   # return the first (in ParRep.sols order) solution close to new_sol, None if none
+        key = self.key(new_sol.a_vals)
+        cand = []   # rows of solutions in the neighbor cells
+        for offset in self.offsets:
+            rows = self.cells.get(tuple(k + o for (k, o) in zip(key, offset)))
+            if rows:
+                cand.extend(rows)
+        for row in sorted(cand):
+            s2 = ParSol(self.arch, row)
+            if new_sol.is_close(s2, self.tol):  # sets new_sol.closeTo and distMx
+                return s2
+        return None
+
+    def domin(self, new_sol):   # return (solutions dominated by new_sol, solution dominating new_sol or None)
+        """same results as for the ParRep.sols loop: new_sol.cmp(s2) until the first s2 dominating new_sol."""
+        n_sols = self.arch.n_sols
+        a_vals = self.arch.a_vals[:n_sols]
+        alive = self.arch.state[:n_sols] == UNIQUE
+        vals = self.arch.a_vals[new_sol.row]
+        not_worse = np.all(vals >= a_vals, axis=1) & alive     # cmp() == 1: new_sol dominates (or is equal)
+        dominated = np.all(vals <= a_vals, axis=1) & alive & ~not_worse     # cmp() == -1: new_sol is dominated
+        rows_dom = np.flatnonzero(dominated)
+        last = rows_dom[0] if len(rows_dom) else n_sols     # the scan stops at the first dominating solution
+        to_prune = [ParSol(self.arch, int(row)) for row in np.flatnonzero(not_worse[:last])]
+        return to_prune, (ParSol(self.arch, int(last)) if last < n_sols else None)
+
+
+# noinspection SpellCheckingInspection
+class NearIdx:
+    """nearest (in L-inf) next neighbor of each solution of ParRep.sols, updated on adding and removing solutions.
+
+    As in the (previously used) pair-loop of ParRep.solDistr(), the neighbor of a solution is the closest of the
+    solutions following it in ParRep.sols (the first one, if several are equally close); the last solution has none.
+    """
+    def __init__(self, arch, size=256):
+        self.arch = arch    # SolArch object
+        self.dist = np.full(size, np.inf)   # distance to the neighbor (indexed by the arch rows)
+        self.neigh = np.full(size, -1, dtype=np.int64)     # row of the neighbor (-1: none)
+
+    def alive(self):    # return rows of the solutions in ParRep.sols
+        return np.flatnonzero(self.arch.state[:self.arch.n_sols] == UNIQUE)
+
+    def add(self, s):   # update neighbors of the previous solutions by the new (last) solution s
+        n_new = len(self.arch.itr_id) - len(self.dist)
+        if n_new > 0:   # resize the arrays to the arch size
+            self.dist = np.concatenate([self.dist, np.full(n_new, np.inf)])
+            self.neigh = np.concatenate([self.neigh, np.full(n_new, -1, dtype=np.int64)])
+        rows = self.alive()
+        rows = rows[rows < s.row]
+        dist = np.abs(self.arch.a_vals[rows] - self.arch.a_vals[s.row]).max(axis=1)
+        closer = dist < self.dist[rows]     # the previous neighbor kept, if equally close
+        self.dist[rows[closer]] = dist[closer]
+        self.neigh[rows[closer]] = s.row
+
+    def remove(self, s):    # find new neighbors for the solutions having the removed solution s as the neighbor
+        self.dist[s.row] = np.inf
+        self.neigh[s.row] = -1
+        rows = self.alive()
+        for row in rows[self.neigh[rows] == s.row]:
+            nxt = rows[rows > row]
+            if len(nxt) == 0:
+                self.dist[row] = np.inf
+                self.neigh[row] = -1
+                continue
+            dist = np.abs(self.arch.a_vals[nxt] - self.arch.a_vals[row]).max(axis=1)
+            ind = int(dist.argmin())
+            self.dist[row] = dist[ind]
+            self.neigh[row] = nxt[ind]
+
+
+# noinspection SpellCheckingInspection
+class CritIdx:
+    """solutions of ParRep.sols sorted by the achievement of each criterion (for finding the nearest solutions)."""
+    def __init__(self, arch):
+        self.arch = arch    # SolArch object
+        self.srt = [[] for _ in range(arch.n_crit)]    # for each criterion: sorted list of (a_val, row)
+
+    def add(self, s):   # add the solution
+        for (i, a_val) in enumerate(s.a_vals):
+            bisect.insort(self.srt[i], (a_val, s.row))
+
+    def remove(self, s):    # remove the solution
+        for (i, a_val) in enumerate(s.a_vals):
+            lst = self.srt[i]
+            del lst[bisect.bisect_left(lst, (a_val, s.row))]
+
+    def near(self, s, k):   # return sorted rows of the k nearest solutions to s for each criterion (s excluded)
+        rows = set()
+        for (i, a_val) in enumerate(s.a_vals):
+            lst = self.srt[i]
+            pos = bisect.bisect_left(lst, (a_val, s.row))
+            left = pos - 1
+            right = pos + 1 if pos < len(lst) and lst[pos][1] == s.row else pos  # skip s
+            for _ in range(k):  # merge the nearest from the left and right side of s
+                if left >= 0 and (right >= len(lst) or a_val - lst[left][0] <= lst[right][0] - a_val):
+                    rows.add(lst[left][1])
+                    left -= 1
+                elif right < len(lst):
+                    rows.add(lst[right][1])
+                    right += 1
+                else:
+                    break
+        return sorted(rows)
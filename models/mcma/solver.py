@@ -0,0 +1,147 @@
+"""
+Provide the solver used in the iteration loop: either a file-based (default) or a persistent one
+"""
+import sys		# needed for sys.stdout.flush()
+import pyomo.environ as pe
+from pyomo.opt import SolverStatus
+from pyomo.opt import TerminationCondition
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+from pyomo.contrib.appsi.base import PersistentSolver as AppsiSolver
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+def chk_sol(res):  # check status of the solution
+    # print(f'solver status: {res.solver.status}, termination condition: {res.solver.termination_condition}.')
+    if ((res.solver.status != SolverStatus.ok) or
+            (res.solver.termination_condition != TerminationCondition.optimal)):
+        print(f'optimization failed; termination condition: {res.solver.termination_condition}')
+        sys.stdout.flush()  # desired for assuring printing exception at the output end
+        '''
+        # non-optimal solutions are handled now, commented exceptions kept here in case they should be needed
+        if res.solver.termination_condition == TerminationCondition.infeasible:
+            raise Exception('Optimization problem is infeasible.')
+        elif res.solver.termination_condition == TerminationCondition.unbounded:
+            raise Exception('Optimization problem is unbounded.')
+        else:
+            raise Exception('Optimization failed.')
+        '''
+        return False     # optimization failed
+    else:
+        return True     # optimization OK
+
+
+# noinspection SpellCheckingInspection
+class Solver:
+    """solve the aggregate model composed of the core model (m1) and the mc-part block."""
+    def __init__(self, wflow, m1):
+        self.wflow = wflow
+        self.mc = wflow.mc
+        self.m1 = m1    # instance of the core model
+        self.verb = self.mc.verb
+        # select solver (default glpk, other solvers can be selected in cfg.yml by: solver: solver_id
+        # glpk - solves LP and MIP; iopt - solves LP and NL, but not MIP; gams uses cplex (but with the interface overhead)
+        self.solver_id = self.mc.opt('solver', 'glpk')
+        self.persist = self.mc.opt('persistent', False)   # keep one solver instance (and the core model) for all itrs
+        # aggregate model composed of two blocks: (1) core model and (2) mc_part, kept for the whole run
+        self.m = pe.ConcreteModel()
+        self.m.add_component('core_model', m1)  # m.m1 = m1  assign works but (due to warning) replaced by add_component()
+        self.is_set = False     # set to True after the instance is loaded to the (non-appsi) persistent solver
+        self.rows = []          # constraints of the mc_part loaded to the (non-appsi) persistent solver
+        self.is_appsi = False   # True for appsi-solvers (these detect the model changes themselves)
+        self.opt = None
+        if self.persist:
+            solver_id = self.solver_id
+            if not (solver_id.startswith('appsi_') or solver_id.endswith('_persistent')):
+                solver_id = f'{solver_id}_persistent'   # e.g., gurobi -> gurobi_persistent
+            opt = pe.SolverFactory(solver_id)
+            if isinstance(opt, (PersistentSolver, AppsiSolver)):
+                self.solver_id = solver_id
+                self.opt = opt
+                self.is_appsi = isinstance(opt, AppsiSolver)
+            else:
+                print(f'WARNING: persistent interface of solver "{self.solver_id}" not available; '
+                      f'the file-based interface is used.')
+                self.persist = False
+        if self.opt is None:
+            self.opt = pe.SolverFactory(self.solver_id)
+        print(f'Selected solver_id: {self.solver_id}, persistent mode: {self.persist}')
+        # names of the core-model vars needed for processing a solution (criteria and the reported vars)
+        self.sol_vars = [cr.var_name for cr in self.mc.cr]
+        for var_name in self.mc.opt('rep_vars', []):
+            if var_name not in self.sol_vars:
+                self.sol_vars.append(var_name)
+
+    @timed('solve')
+    def solve(self, mc_part, warm=False):   # solve the model composed of (1) core model m1, (2) MC-part
+        m = self.m
+        cur_part = m.component('mc_part')
+        if cur_part is not mc_part:     # attach the mc_part (replace the previous one, if any)
+            if cur_part is not None:
+                m.del_component(cur_part)
+                self.is_set = False     # the (non-appsi) persistent solver is loaded again with the new mc_part
+            m.add_component('mc_part', mc_part)  # add_component() used instead of simple assignment
+        if self.verb > 3:
+            print('core-model and mc-part blocks added to the model instance; ready for optimization.')
+            m.pprint()
+        if not self.persist or self.is_appsi:   # appsi solvers update (only the changed components) at solve()
+            # results = opt.solve(m, tee=True)
+            if warm:    # start from the current values of the vars (set by WarmStart)
+                return self.opt.solve(m, tee=False, warmstart=True)
+            return self.opt.solve(m, tee=False)
+        if self.is_set:
+            self.upd_rows(mc_part)
+        else:
+            self.opt.set_instance(m)    # the core model is loaded only once
+            self.rows = list(mc_part.component_data_objects(pe.Constraint, active=True))
+            self.is_set = True
+        if warm:
+            return self.opt.solve(tee=False, warmstart=True)
+        return self.opt.solve(tee=False)
+
+    # The mc_part block stays loaded in the (non-appsi) persistent solver; its params, constraint activity, and the
+    # fixed x vars are changed by McMod.mc_itr() before solve(). Therefore the block cannot be removed (remove_block()
+    # requires the unchanged block, and the objective references its af var); instead its (few) rows loaded at the
+    # previous itr are removed (the solver keeps its own map of these rows), the x vars are updated, and the active
+    # rows (made from the current params) are added.
+    def upd_rows(self, mc_part):   # replace the mc_part rows in the (non-appsi) persistent solver
+        for con in self.rows:
+            self.opt.remove_constraint(con)
+        for var in mc_part.x.values():
+            self.opt.update_var(var)
+        self.rows = list(mc_part.component_data_objects(pe.Constraint, active=True))
+        for con in self.rows:
+            self.opt.add_constraint(con)
+        self.opt.set_objective(self.objective(mc_part))
+
+    @staticmethod
+    def objective(mc_part):     # return the active objective of the mc_part
+        for obj in mc_part.component_data_objects(pe.Objective, active=True):
+            return obj
+        raise Exception(f'Solver::objective(): the mc-part block has no active objective.')
+
+    def get_rec(self, mc_part):    # return record of the solution values needed for processing the solution
+        rec = {}
+        m1_vars = self.m1.component_map(ctype=pe.Var)  # all variables of the m1 (core model)
+        for var_name in self.sol_vars:
+            m1_var = m1_vars[var_name]
+            if m1_var.is_indexed():
+                rec.update({var_name: m1_var.extract_values()})    # values returned in dict (indexes as keys)
+            else:
+                rec.update({var_name: m1_var.value})
+        for var in [mc_part.af, mc_part.cafMin, mc_part.cafReg]:
+            rec.update({var.local_name: var.value})
+        return rec
+
+    def set_rec(self, rec, mc_part):    # load the solution values (provided by get_rec()) to the model vars
+        m1_vars = self.m1.component_map(ctype=pe.Var)  # all variables of the m1 (core model)
+        for var_name in self.sol_vars:
+            m1_var = m1_vars[var_name]
+            val = rec.get(var_name)
+            if m1_var.is_indexed():
+                for (ind, v) in val.items():
+                    m1_var[ind].set_value(v, skip_validation=True)
+            else:
+                m1_var.set_value(val, skip_validation=True)
+        for var in [mc_part.af, mc_part.cafMin, mc_part.cafReg]:
+            var.set_value(rec.get(var.local_name), skip_validation=True)
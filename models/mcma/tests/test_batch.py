@@ -0,0 +1,56 @@
+"""
+Runs of the complete workflow with the cubes solved in batches (option batch) until the candidate cubes are exhausted
+"""
+import os
+import numpy as np
+import pytest
+
+pe = pytest.importorskip('pyomo.environ')
+dill = pytest.importorskip('dill')
+pytest.importorskip('highspy')
+
+
+def mk_model(f_name, n_pts=20, seed=5):     # store the dill file of a small 3-criteria MIP model (a discrete front)
+    rng = np.random.default_rng(seed)
+    pts = rng.dirichlet([1., 1., 1.], n_pts) ** 0.5 * 100.
+    m = pe.ConcreteModel('disc')
+    m.K = pe.RangeSet(0, n_pts - 1)
+    m.z = pe.Var(m.K, within=pe.Binary)
+    m.q1 = pe.Var(bounds=(0., None))
+    m.q2 = pe.Var(bounds=(0., None))
+    m.q3 = pe.Var(bounds=(0., None))
+    m.one = pe.Constraint(expr=sum(m.z[k] for k in m.K) == 1)
+    m.c1 = pe.Constraint(expr=m.q1 <= sum(pts[k, 0] * m.z[k] for k in m.K))
+    m.c2 = pe.Constraint(expr=m.q2 <= sum(pts[k, 1] * m.z[k] for k in m.K))
+    m.c3 = pe.Constraint(expr=m.q3 <= sum(pts[k, 2] * m.z[k] for k in m.K))
+    m.goal = pe.Objective(expr=m.q1 + m.q2 + m.q3, sense=pe.maximize)
+    with open(f_name, 'wb') as f:
+        dill.dump(m, f, byref=False, recurse=True)
+
+
+def run(ana_dir, opts):     # run the analysis in ana_dir, return the WrkFlow object
+    import yaml
+    from mcma.cfg import Config
+    from mcma.driver import driver
+    cfg = {'model_id': './disc', 'crit_def': [['q1', 'max', 'q1'], ['q2', 'max', 'q2'], ['q3', 'max', 'q3']],
+           'solver': 'appsi_highs', 'mxIter': 400, 'mxGap': 10, 'showPlot': False, 'verb': 0}
+    cfg.update(opts)
+    cwd = os.getcwd()
+    os.chdir(ana_dir)
+    try:
+        mk_model('disc.dll')
+        with open('cfg.yml', 'w') as f:
+            yaml.dump(cfg, f)
+        return driver(Config().data)
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.mark.parametrize('opts', [{'batch': 3}, {'batch': 3, 'memoTol': 0.5}])
+def test_batch_exhausts_cubes(tmp_path, monkeypatch, opts):
+    monkeypatch.setenv('MPLBACKEND', 'Agg')
+    wflow = run(tmp_path, opts)
+    assert wflow.cur_stage == 6     # the analysis finished (all cubes processed) before mxIter
+    assert len(wflow.par_rep.sols) > 3
+    assert os.path.exists(tmp_path / 'Results' / 'parFront.csv')
+    assert os.path.exists(tmp_path / 'Results' / 'timings.csv')
@@ -0,0 +1,80 @@
+"""
+Indices of the Pareto solutions (SolIdx, NearIdx) compared with the linear scans of ParRep.sols they replace
+"""
+import numpy as np
+import pytest
+from mcma.sol_arch import SolArch, SolList, UNIQUE, CLOSE
+from mcma.sol_idx import SolIdx, NearIdx
+
+
+def scan_close(new_sol, sols, tol):     # the first (in sols order) solution close to new_sol, None if none
+    for s2 in sols:
+        if new_sol.is_close(s2, tol):
+            return s2
+    return None
+
+
+def scan_domin(new_sol, sols):  # (solutions dominated by new_sol, the first solution dominating new_sol or None)
+    to_prune = []
+    for s2 in sols:
+        cmp = new_sol.cmp(s2)
+        if cmp == 1:
+            to_prune.append(s2)
+        elif cmp == -1:
+            return to_prune, s2
+    return to_prune, None
+
+
+def scan_near(arch, sols):  # {row: (dist, row of the neighbor)}: the closest of the following sols, the first on ties
+    rows = sols.rows()
+    near = {}
+    for (i, row) in enumerate(rows.tolist()):
+        nxt = rows[i + 1:]
+        if len(nxt) == 0:
+            near.update({row: (np.inf, -1)})
+            continue
+        dist = np.abs(arch.a_vals[nxt] - arch.a_vals[row]).max(axis=1)
+        ind = int(dist.argmin())
+        near.update({row: (dist[ind], int(nxt[ind]))})
+    return near
+
+
+# achievements near a (concave) front, on a coarse grid (step): many ties, duplicated, close, and dominated solutions
+@pytest.mark.parametrize('n_crit, step, tol, seed', [(3, 5., 0.01, 1), (3, 1., 2., 2), (2, 2., 1., 3),
+                                                     (5, 10., 10., 4)])
+def test_idx(n_crit, step, tol, seed):
+    rng = np.random.default_rng(seed)
+    arch = SolArch(n_crit, size=8)  # small size: the arrays are also resized
+    sols = SolList(arch, UNIQUE)
+    cl_sols = SolList(arch, CLOSE)
+    sol_idx = SolIdx(arch, tol)
+    near_idx = NearIdx(arch, size=8)
+    n_close = n_removed = 0
+    for itr_id in range(300):
+        a_vals = rng.dirichlet(np.ones(n_crit)) ** 0.5
+        a_vals *= rng.uniform(90., 100.) / np.linalg.norm(a_vals)
+        a_vals = np.round(a_vals / step) * step
+        new_sol = arch.add(itr_id, None, a_vals, a_vals)
+        s_scan = scan_close(new_sol, sols, tol)
+        scan_inf = (new_sol.closeTo, new_sol.distMx)     # set by is_close()
+        s_close = sol_idx.close(new_sol)
+        assert s_close == s_scan
+        if s_close is not None:
+            assert (new_sol.closeTo, new_sol.distMx) == scan_inf
+            cl_sols.append(new_sol)
+            n_close += 1
+            continue
+        (to_prune, s_dom) = sol_idx.domin(new_sol)
+        assert (to_prune, s_dom) == scan_domin(new_sol, sols)
+        if s_dom is None:
+            sols.append(new_sol)
+            sol_idx.add(new_sol)
+            near_idx.add(new_sol)
+        for s2 in to_prune:     # as in ParRep.addSol(): also, if new_sol is dominated
+            sols.remove(s2)
+            sol_idx.remove(s2)
+            near_idx.remove(s2)
+            n_removed += 1
+        for (row, (dist, neigh)) in scan_near(arch, sols).items():
+            assert (near_idx.dist[row], near_idx.neigh[row]) == (dist, neigh)
+    assert n_close > 0 and n_removed > 0 and len(sols) > 1
@@ -0,0 +1,94 @@
+"""
+Timing of the phases (model update, solver, solution processing, etc) of each iteration
+"""
+import functools
+from time import perf_counter
+import pandas as pd
+
+
+def timed(phase):   # decorator: the time of each call of the decorated function is assigned to the phase
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tm = Timer.cur
+            if tm is None:  # timing not activated (e.g., in the worker processes)
+                return func(*args, **kwargs)
+            tm.start(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tm.stop()
+        return wrapper
+    return decorator
+
+
+# noinspection SpellCheckingInspection
+class Timer:    # exclusive times of (possibly nested) phases, collected for each iteration
+    cur = None  # the active Timer object (used by the timed() decorator)
+
+    def __init__(self):
+        self.stack = []     # [phase, start time] of the currently executed (nested) phases
+        self.phases = []    # names of phases (in the order of the first use)
+        self.row = {}       # exclusive times of phases in the current itr
+        self.rows = []      # rows (itr_id, wall-clock time of itr, times of phases) of the already finished itrs
+        self.tot = {}       # total times of phases (also of those executed outside itrs)
+        self.itr_t0 = None  # start time of the current itr
+
+    def activate(self):     # make self the timer used by timed()
+        Timer.cur = self
+        self.stack = []
+        self.itr_t0 = perf_counter()
+
+    def start(self, phase):
+        t = perf_counter()
+        if len(self.stack):     # suspend the parent phase
+            self.add(self.stack[-1][0], t - self.stack[-1][1])
+        self.stack.append([phase, t])
+
+    def stop(self):
+        t = perf_counter()
+        phase, t0 = self.stack.pop()
+        self.add(phase, t - t0)
+        if len(self.stack):     # resume the parent phase
+            self.stack[-1][1] = t
+
+    def add(self, phase, dt):
+        if phase not in self.tot:
+            self.phases.append(phase)
+            self.tot.update({phase: 0.})
+        self.tot[phase] += dt
+        self.row[phase] = self.row.get(phase, 0.) + dt
+
+    def itr_end(self, itr_id):  # store times of the finished itr
+        t = perf_counter()
+        if self.itr_t0 is not None:
+            self.rows.append([itr_id, t - self.itr_t0, self.row])
+        self.row = {}
+        self.itr_t0 = t
+
+    def df(self):   # return df with times [ms] of phases in each itr; 'other' is the time outside the timed phases
+        phases = [phase for phase in self.phases if any(phase in row[2] for row in self.rows)]
+        recs = []
+        for (itr_id, itr_time, row) in self.rows:
+            rec = {'itr_id': itr_id, 'itr': 1000. * itr_time}
+            for phase in phases:
+                rec.update({phase: 1000. * row.get(phase, 0.)})
+            rec.update({'other': 1000. * (itr_time - sum(row.values()))})
+            recs.append(rec)
+        return pd.DataFrame(recs)
+
+    def summary(self, f_name):  # store times of itrs in the f_name csv-file, print summary of all phases
+        df = self.df()
+        df.to_csv(f_name, index=False, float_format='%.4f')
+        tot_itr = sum(row[1] for row in self.rows)
+        print(f'\nTimes of phases of {len(self.rows)} itrs (stored in "{f_name}"):')
+        print(f'{"phase":<10} {"total [s]":>10} {"mean [ms]":>10} {"max [ms]":>10} {"share [%]":>10}')
+        for phase in self.phases + ['other']:
+            if phase in df:
+                col = df[phase]
+                tot = col.sum() / 1000.
+                print(f'{phase:<10} {tot:>10.3f} {col.mean():>10.3f} {col.max():>10.3f} '
+                      f'{100. * tot / max(tot_itr, 1.e-9):>10.1f}')
+            else:   # phase executed outside itrs
+                print(f'{phase:<10} {self.tot.get(phase):>10.3f} {"":>10} {"":>10} {"":>10}')
+        print(f'{"all itrs":<10} {tot_itr:>10.3f}')
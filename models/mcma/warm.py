@@ -0,0 +1,57 @@
+"""
+Warm starts of the optimizations for cubes from the solutions defining the cubes (option warmStart)
+"""
+import numpy as np
+import pyomo.environ as pe
+from .timing import timed  # timing of the iteration phases
+
+
+# noinspection SpellCheckingInspection
+class WarmStart:
+    """values of the integer vars of the core model stored for each solution (itr_id).
+
+    The optimization for a cube is started (warmstart option of the solver) from the stored values of a solution
+    defining the cube (i.e., a parent of the new solution). Used only for the MIP core models and the solvers
+    capable of the warm start (e.g., appsi_highs, gurobi, cplex, cbc); the LP basis is not stored, because the
+    persistent solvers (option persistent) restart each optimization from the basis of the previous one.
+    """
+    def __init__(self, wflow, solv):
+        self.wflow = wflow  # WrkFlow object
+        self.solv = solv    # Solver object
+        self.vars = []      # integer vars of the core model
+        self.starts = {}    # key: itr_id, val: values of self.vars (nan for undefined values)
+        self.n_warm = 0     # number of warm-started optimizations
+        if not solv.opt.warm_start_capable():
+            print(f'WARNING: solver "{solv.solver_id}" is not capable of warm starts; the warmStart option ignored.')
+            return
+        self.vars = [var for var in solv.m1.component_data_objects(pe.Var) if var.is_integer() and not var.fixed]
+        if not len(self.vars):
+            print(f'The core model has no integer vars: warm starts not used.')
+        else:
+            print(f'Optimizations for cubes warm-started from the values of {len(self.vars)} integer vars.')
+
+    @timed('warmStart')
+    def add(self, itr_id):  # store the values of the integer vars of the solution itr_id
+        if len(self.vars):
+            self.starts.update({itr_id: np.array([np.nan if var.value is None else var.value for var in self.vars])})
+
+    @timed('warmStart')
+    def set_start(self):    # set the vars to the values of a parent solution of the current cube; return True if set
+        par_rep = self.wflow.par_rep
+        if not len(self.starts) or self.wflow.cur_stage != 4 or par_rep is None or par_rep.cur_cube is None:
+            return False
+        vals = None
+        for s in par_rep.cubes.get(par_rep.cur_cube).verts():
+            vals = self.starts.get(s.itr_id)
+            if vals is not None:
+                break
+        if vals is None:
+            return False
+        for (var, val) in zip(self.vars, vals):
+            if not np.isnan(val):
+                var.set_value(val, skip_validation=True)
+        self.n_warm += 1
+        return True
+
+    def summary(self):
+        print(f'Warm starts: {self.n_warm} optimizations started from the solutions of {len(self.starts)} parents.')
@@ -12,6 +12,8 @@ from .corners import Corners
 from .par_repr import ParRep
 from .neigh import Neigh
 from .grid import Grid
+from .simplex import Simplex
+from .timing import Timer, timed  # timing of the iteration phases
 
 
 # noinspection SpellCheckingInspection
@@ -42,11 +44,14 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
         # self.is_par_rep = cfg.get('parRep')    # if True, then switch to ParetoRepresentation mode
         self.is_par_rep = True    # only ParetoRepresentation mode is avail. (handling usr-specs of A/R not tested)
         self.deg_exp = False    # expansion of degenerated cube dimensions
+        self.tm = Timer()   # times of the phases of itrs
+        self.n_reset = 0    # number of resets (after nadir updates); preferences made before a reset are obsolete
         self.usrAR = self.mc.opt('usrAR', None)     # optionally defined file with usr-defined AR
         if self.usrAR is not None:
             self.is_par_rep = False
             self.mc.readPref(self.usrAR)    # read usr-defined AR
 
+    @timed('pref')
     def itr_start(self, n_itr):
         self.n_itr = n_itr
         if self.cur_stage == 1:       # start or continue payoff table
@@ -68,6 +73,63 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
             raise Exception(f'WrkFlow::itr_start() implementation error, stage: {self.cur_stage}.')
         return self.cur_stage
 
+    def batch_ok(self):    # return True, if preferences for the current stage can be generated in batches
+        if self.cur_stage == 1:     # selfish optimizations of a pass of the payoff table
+            return True
+        if self.cur_stage == 2:     # regularized selfish optimizations defining corners
+            return self.corner is not None and not self.corner.all_done
+        if self.cur_stage == 4 and self.is_par_rep:
+            # these generate one pair (simplex) at a time
+            return not (self.mc.opt('mCube', False) or self.mc.opt('grid', False) or self.mc.opt('simplex', False))
+        return False
+
+    @timed('pref')
+    def batch_pref(self, n_itr, n_max):    # return list of (at most n_max) preferences for the next itrs
+        prefs = []
+        if self.cur_stage == 1:     # remaining criteria of the current payoff stage
+            for i_cr in self.payoff.pass_crit()[:n_max]:
+                self.n_itr = n_itr + len(prefs)
+                self.payoff.set_cr(i_cr)
+                prefs.append(self.get_pref())
+            return prefs
+        if self.cur_stage == 2:     # remaining corners
+            while len(prefs) < n_max and not self.corner.all_done:
+                self.itr_start(n_itr + len(prefs))
+                prefs.append(self.get_pref())
+            return prefs
+        for i in range(n_max):
+            self.itr_start(n_itr + i)
+            if self.cur_stage == 6:     # no more preferences
+                break
+            prefs.append(self.get_pref())
+        if len(prefs) and self.cur_stage == 6:
+            self.cur_stage = 4      # process the batch; termination will be detected again by the next itr_start()
+        return prefs
+
+    def get_pref(self):    # return the current preferences (to be restored by set_pref())
+        cube_id = None if self.par_rep is None else self.par_rep.cur_cube
+        corner_id = None if self.corner is None else self.corner.cur_corner
+        return {'stage': self.cur_stage, 'reset': self.n_reset, 'pay_stage': self.payoff.cur_stage,
+                'pay_cr': self.payoff.cur_cr, 'corner': corner_id, 'cube': cube_id,
+                'cr': [cr.getPref() for cr in self.mc.cr]}
+
+    def pref_ok(self, pref):    # return True, if the preferences returned by get_pref() can still be used
+        return (pref.get('stage') == self.cur_stage and pref.get('reset') == self.n_reset and
+                pref.get('pay_stage') == self.payoff.cur_stage)
+
+    def set_pref(self, n_itr, pref):   # restore preferences returned by get_pref(), used instead of itr_start()
+        assert self.pref_ok(pref), f'WrkFlow::set_pref(): preferences made for stage {pref.get("stage")} are obsolete.'
+        self.n_itr = n_itr
+        if self.cur_stage == 1:
+            self.payoff.cur_cr = pref.get('pay_cr')
+        elif self.cur_stage == 2:
+            self.corner.set_cur(pref.get('corner'))
+        if self.par_rep is not None:
+            self.par_rep.cur_cube = pref.get('cube')
+        for (cr, cr_pref) in zip(self.mc.cr, pref.get('cr')):
+            cr.setPref(cr_pref)
+        return self.cur_stage
+
     def in_range(self):     # return True, if the value is within the [U, N] range
         ret_val = True
         for cr in self.mc.cr:
@@ -82,11 +144,34 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
                     ret_val = False
         return ret_val
 
+    def corners_done(self):     # return the stage following the corners
+        self.par_rep.from_cube = True   # preferences for (optional) neutral and the PF to be generated from cubes
+        if self.cfg.get('neutral') is True:
+            return 3
+        return 4     # skip neutral, proceed to Pareto front
+
+    def ini_front(self):    # initialize (if not yet done) the object selecting pairs/simplices for the PF cubes
+        if self.mc.opt('mCube', False):
+            if self.par_rep.neighSol is None:
+                self.par_rep.neighSol = Neigh(self.par_rep)     # initialize with corners and neutral sol.
+        elif self.mc.opt('grid', False):
+            if self.par_rep.grid is None:
+                self.par_rep.grid = Grid(self)  # initialize with corners and neutral sol.
+        elif self.mc.opt('simplex', False):
+            if self.par_rep.simplex is None:
+                self.par_rep.simplex = Simplex(self.par_rep)  # initialize with corners and neutral sol.
+
+    @timed('itrSol')
     def itr_sol(self, mc_part):     # process solution, decide stage for next itr
         # extract and store in crit sol.-values, if in U/N range: add info to report
         in_range = self.rep.itr(mc_part)
+        nad_chg = []    # indices of criteria with the updated nadir
         if not in_range and self.cur_stage > 1:  # checks/updates run after the PayOff table complete
+            nadirs = [cr.nadir for cr in self.mc.cr]
             changed = self.payoff.update(self.cur_stage)  # update payOff table if a nadir changed
+            # the nadir changes smaller than minRange (of the U/N range) are neglected
+            nad_chg = [i for (i, cr) in enumerate(self.mc.cr)
+                       if abs(cr.nadir - nadirs[i]) > cr.minRange * abs(cr.utopia - cr.nadir)]
             # double-check if the solution is within U/N after Nadir updated
             out_range = not self.in_range()
             if changed or out_range:
@@ -96,13 +181,15 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
                     self.cur_stage = 5      # reset
                     self.par_rep.neighSol = None    # destroy the neighbors' object
                     self.par_rep.grid = None    # destroy the neighbors' object
+                    self.par_rep.simplex = None    # destroy the triangulation object
 
         next_stage = self.cur_stage   # by default, continue with the current stage
         if self.cur_stage == 1:       # payoff table
             self.payoff.next_sol()
         elif self.cur_stage == 2:     # corners
             is_pareto = self.par_rep.addSol(self.n_itr)     # store here to get info, it is_Pareto
-            all_done = self.corner.next_sol(is_pareto, self.n_itr)  # store info on corners (only by unique Pareto)
+            close_id = None if is_pareto else self.par_rep.last_close()     # after a reset: maybe a rescaled sol
+            all_done = self.corner.next_sol(is_pareto, self.n_itr, close_id)  # store info on corners (only by Pareto)
             if all_done:
                 # add new
                 # alive_ids = {s.itr_id for s in self.par_rep.sols}
@@ -113,11 +200,7 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
                 #     print(f'corner {i}, sol_id {upd_s_corner[i]}:  ({cor})')
                 # print(f'Switch to computing Pareto-front representation based on cuboids. ===============================')
 
-                if self.cfg.get('neutral') is True:
-                    next_stage = 3
-                else:
-                    next_stage = 4     # skip neutral, proceed to Pareto front
-                self.par_rep.from_cube = True   # preferences for (optional) neutral and the PF to be generated from cubes
+                next_stage = self.corners_done()
                 self.cur_stage = next_stage
         elif self.cur_stage == 3:     # neutral solution
             next_stage = 4  # the neutral done, proceed to Pareto front
@@ -126,25 +209,26 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
         if self.cur_stage < 4:
             pass    # nothing more to do here
         elif self.cur_stage == 4:     # start or continue Pareto front
-            if self.mc.opt('mCube', False):
-                if self.par_rep.neighSol is None:
-                    self.par_rep.neighSol = Neigh(self.par_rep) # initialize with corners and neutral sol.
-                # else:
-                #     raise Exception(f'WrkFlow::itr_sol() - duplicated Neigh-object initialization.')
-                pass
-            elif self.mc.opt('grid', False):
-                if self.par_rep.grid is None:
-                    self.par_rep.grid = Grid(self) # initialize with corners and neutral sol.
-                # else:
-                #     raise Exception(f'WrkFlow::itr_sol() - duplicated Grid-object initialization.')
-                pass
+            self.ini_front()
             # raise Exception(f'WrkFlow::itr_sol() not implemented yet for stage: {self.cur_stage}.')
         elif self.cur_stage == 5:     # reset (after Nadir update)
-            print('\nINFO: PayOff table updated; restarting the Pareto-set representation. ---------------------------')
+            print('\nINFO: PayOff table updated; rescaling the Pareto-set representation. ---------------------------')
             self.mc.scale()  # (re)define scales for criteria values
-            self.corner = Corners(self.mc)  # initialize corners of the Pareto set
+            old_rep = self.par_rep
             self.par_rep = ParRep(self)  # ParRep object, currently always used (not only, if is_par_rep == True)
+            # reuse the solutions computed before the reset; the Grid rays are built only on the corners
+            ids = set(self.corner.c_sols.values()) if self.mc.opt('grid', False) else None
+            self.par_rep.rescale(old_rep, ids)
+            old_corner = self.corner
+            self.corner = Corners(self.mc)  # initialize corners of the Pareto set
+            self.corner.reuse(old_corner, nad_chg, self.par_rep)    # only corners affected by the nadir recomputed
+            self.n_reset += 1
             next_stage = 2
+            if self.corner.all_done:    # no corner affected, proceed to the neutral or to the PF
+                next_stage = self.corners_done()
+                self.cur_stage = next_stage
+                if self.cur_stage == 4:
+                    self.ini_front()
             # raise Exception(f'WrkFlow::itr_sol() not implemented yet for stage: {self.cur_stage}.')
         elif self.cur_stage == 6:  # finish; no more cubes to be processed
             return next_stage
@@ -171,5 +255,12 @@ class WrkFlow:   # payoff table: try to download, set A/R for computing, update
             if self.par_rep.grid.getPair() == (None, None):
                 print('\nNo more condidates for making cubes. -------------------------------------------')
                 next_stage = 6
+        if self.cur_stage == 4 and self.par_rep.indic.stop():   # hypervolume gain below the hvStop (if used)
+            print('\nNo significant improvement of the representation. -------------------------------------------')
+            next_stage = 6
+        if self.cur_stage > 3 and self.par_rep.simplex is not None:
+            if self.par_rep.simplex.getSimplex() is None:
+                print('\nNo more condidates for making cubes. -------------------------------------------')
+                next_stage = 6
         self.cur_stage = next_stage
         return next_stage